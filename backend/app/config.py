@@ -12,4 +12,122 @@ class Settings:
     MAIL_USERNAME: str = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD: str = os.getenv("MAIL_PASSWORD")
 
-settings = Settings()
\ No newline at end of file
+    # Groq HTTP pool (shared by every interview on the worker)
+    GROQ_MAX_CONNECTIONS: int = int(os.getenv("GROQ_MAX_CONNECTIONS", "100"))
+    GROQ_MAX_KEEPALIVE: int = int(os.getenv("GROQ_MAX_KEEPALIVE", "20"))
+    GROQ_TIMEOUT: float = float(os.getenv("GROQ_TIMEOUT", "30"))
+
+    # Aura TTS: forward chunks as they arrive and synthesize ahead
+    TTS_PIPELINED: bool = os.getenv("TTS_PIPELINED", "true").lower() == "true"
+    TTS_LOOKAHEAD: int = int(os.getenv("TTS_LOOKAHEAD", "1"))
+    # Pipelined audio goes out in frames of this length (whole samples)
+    TTS_FRAME_MS: int = int(os.getenv("TTS_FRAME_MS", "200"))
+
+    # Session warm-up started by /api/interview/init
+    PREWARM_TTL_SECONDS: float = float(os.getenv("PREWARM_TTL_SECONDS", "120"))
+    PREWARM_STT: bool = os.getenv("PREWARM_STT", "false").lower() == "true"
+
+    # TTS audio cache (memory LRU + optional disk tier)
+    TTS_CACHE_MAX_BYTES: int = int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    TTS_CACHE_MAX_ENTRY_BYTES: int = int(os.getenv("TTS_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+    TTS_CACHE_DIR: str = os.getenv("TTS_CACHE_DIR", "")
+    TTS_CACHE_DISK_MAX_BYTES: int = int(os.getenv("TTS_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+
+    # Barge-in: let the candidate interrupt assistant speech
+    BARGE_IN_ENABLED: bool = os.getenv("BARGE_IN_ENABLED", "false").lower() == "true"
+    BARGE_IN_MIN_WORDS: int = int(os.getenv("BARGE_IN_MIN_WORDS", "2"))
+
+    # Speculative LLM generation on Flux EagerEndOfTurn
+    SPECULATIVE_LLM_ENABLED: bool = os.getenv("SPECULATIVE_LLM_ENABLED", "false").lower() == "true"
+    EAGER_EOT_THRESHOLD: float = float(os.getenv("EAGER_EOT_THRESHOLD", "0.5"))
+
+    # LLM context window: recent turns verbatim, older ones summarized
+    CONTEXT_RECENT_TURNS: int = int(os.getenv("CONTEXT_RECENT_TURNS", "8"))
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+    CONTEXT_SUMMARY_BATCH: int = int(os.getenv("CONTEXT_SUMMARY_BATCH", "4"))
+
+    # Resume parsing at /init
+    RESUME_MAX_BYTES: int = int(os.getenv("RESUME_MAX_BYTES", str(5 * 1024 * 1024)))
+    RESUME_MAX_PAGES: int = int(os.getenv("RESUME_MAX_PAGES", "5"))
+    RESUME_PARSE_TIMEOUT: float = float(os.getenv("RESUME_PARSE_TIMEOUT", "10"))
+    RESUME_MAX_TOKENS: int = int(os.getenv("RESUME_MAX_TOKENS", "1200"))
+    RESUME_CACHE_SIZE: int = int(os.getenv("RESUME_CACHE_SIZE", "256"))
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", "2"))
+
+    # Report job queue
+    REPORT_WORKERS: int = int(os.getenv("REPORT_WORKERS", "2"))
+    REPORT_MAX_ATTEMPTS: int = int(os.getenv("REPORT_MAX_ATTEMPTS", "4"))
+    REPORT_RETRY_BASE_SECONDS: float = float(os.getenv("REPORT_RETRY_BASE_SECONDS", "30"))
+    REPORT_POLL_SECONDS: float = float(os.getenv("REPORT_POLL_SECONDS", "10"))
+    REPORT_STALE_SECONDS: float = float(os.getenv("REPORT_STALE_SECONDS", "600"))
+
+    # Database pools (sync engine and asyncpg engine each get their own)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_COMMAND_TIMEOUT: float = float(os.getenv("DB_COMMAND_TIMEOUT", "30"))
+
+    # Write-behind transcript checkpoints during live interviews
+    CHECKPOINT_EVERY_TURNS: int = int(os.getenv("CHECKPOINT_EVERY_TURNS", "2"))
+    CHECKPOINT_EVERY_SECONDS: float = float(os.getenv("CHECKPOINT_EVERY_SECONDS", "10"))
+
+    # Resumable websocket sessions
+    SESSION_RESUME_GRACE_SECONDS: float = float(os.getenv("SESSION_RESUME_GRACE_SECONDS", "30"))
+    REPLAY_BUFFER_MAX_BYTES: int = int(os.getenv("REPLAY_BUFFER_MAX_BYTES", str(4 * 1024 * 1024)))
+
+    # Deepgram HTTP pool (TTS requests from every session share it)
+    DEEPGRAM_MAX_CONNECTIONS: int = int(os.getenv("DEEPGRAM_MAX_CONNECTIONS", "100"))
+    DEEPGRAM_MAX_KEEPALIVE: int = int(os.getenv("DEEPGRAM_MAX_KEEPALIVE", "20"))
+    # Per-request HTTP timeout (Aura); same as the SDK's own default
+    DEEPGRAM_TIMEOUT: float = float(os.getenv("DEEPGRAM_TIMEOUT", "60"))
+
+    # Energy VAD gating mic audio before it reaches Flux
+    VAD_ENABLED: bool = os.getenv("VAD_ENABLED", "false").lower() == "true"
+    VAD_RMS_THRESHOLD: float = float(os.getenv("VAD_RMS_THRESHOLD", "300"))
+    VAD_ZCR_MAX: float = float(os.getenv("VAD_ZCR_MAX", "0.35"))
+    VAD_HANGOVER_MS: float = float(os.getenv("VAD_HANGOVER_MS", "2000"))
+    VAD_PREROLL_MS: float = float(os.getenv("VAD_PREROLL_MS", "300"))
+    VAD_KEEPALIVE_MS: float = float(os.getenv("VAD_KEEPALIVE_MS", "500"))
+
+    # Inbound mic audio: coalesced chunk size and queue bound towards Flux
+    AUDIO_CHUNK_MS: int = int(os.getenv("AUDIO_CHUNK_MS", "40"))
+    AUDIO_QUEUE_MAX_CHUNKS: int = int(os.getenv("AUDIO_QUEUE_MAX_CHUNKS", "50"))
+
+    # LLM -> TTS sentence segmentation (characters / milliseconds)
+    SEGMENT_MIN_CHARS: int = int(os.getenv("SEGMENT_MIN_CHARS", "20"))
+    SEGMENT_MAX_CHARS: int = int(os.getenv("SEGMENT_MAX_CHARS", "240"))
+    SEGMENT_FIRST_CLAUSE_MS: float = float(os.getenv("SEGMENT_FIRST_CLAUSE_MS", "400"))
+
+    # Per-turn latency tracing (optionally saved to turn_latencies)
+    TRACE_ENABLED: bool = os.getenv("TRACE_ENABLED", "true").lower() == "true"
+    TRACE_PERSIST: bool = os.getenv("TRACE_PERSIST", "false").lower() == "true"
+
+    # Event-loop lag sampling interval (seconds) for /metrics
+    LOOP_LAG_INTERVAL: float = float(os.getenv("LOOP_LAG_INTERVAL", "0.25"))
+
+    # Opt-in watchdog thread that dumps the loop's stack when it stalls
+    LOOP_WATCHDOG_ENABLED: bool = os.getenv("LOOP_WATCHDOG_ENABLED", "false").lower() == "true"
+    LOOP_WATCHDOG_THRESHOLD_MS: float = float(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "200"))
+
+    # Logging (app.core.log): level, and 1-in-N sampling for per-token events
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_SAMPLE_EVERY: int = int(os.getenv("LOG_SAMPLE_EVERY", "50"))
+
+    # External providers (app.services.providers): "fake" swaps in the
+    # offline stand-ins from app.services.fake_providers
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "groq").lower()
+    STT_PROVIDER: str = os.getenv("STT_PROVIDER", "deepgram").lower()
+    TTS_PROVIDER: str = os.getenv("TTS_PROVIDER", "deepgram").lower()
+
+    # Fake provider behaviour. Scripts are text files with one reply /
+    # utterance per line; empty means the built-in ones.
+    FAKE_LLM_SCRIPT: str = os.getenv("FAKE_LLM_SCRIPT", "")
+    FAKE_LLM_FIRST_TOKEN_MS: float = float(os.getenv("FAKE_LLM_FIRST_TOKEN_MS", "300"))
+    FAKE_LLM_TOKEN_MS: float = float(os.getenv("FAKE_LLM_TOKEN_MS", "15"))
+    FAKE_STT_SCRIPT: str = os.getenv("FAKE_STT_SCRIPT", "")
+    FAKE_STT_LATENCY_MS: float = float(os.getenv("FAKE_STT_LATENCY_MS", "50"))
+    FAKE_STT_EOT_SILENCE_MS: float = float(os.getenv("FAKE_STT_EOT_SILENCE_MS", "600"))
+    FAKE_TTS_FIRST_AUDIO_MS: float = float(os.getenv("FAKE_TTS_FIRST_AUDIO_MS", "150"))
+    FAKE_TTS_CHARS_PER_SECOND: float = float(os.getenv("FAKE_TTS_CHARS_PER_SECOND", "15"))
+
+settings = Settings()
@@ -0,0 +1,66 @@
+import asyncio
+from typing import List, Optional
+
+
+class FrameCoalescer:
+    """
+    Packs arbitrarily sized PCM writes into fixed-size chunks.
+
+    Bytes are copied into one preallocated bytearray; a chunk is emitted
+    each time it fills up, so tiny client frames become a steady stream of
+    equally sized sends.
+    """
+
+    def __init__(self, chunk_bytes: int):
+        self.chunk_bytes = chunk_bytes
+        self._buf = bytearray(chunk_bytes)
+        self._view = memoryview(self._buf)
+        self._fill = 0
+
+    def push(self, data: bytes) -> List[bytes]:
+        chunks = []
+        src = memoryview(data)
+        pos = 0
+        while pos < len(src):
+            n = min(self.chunk_bytes - self._fill, len(src) - pos)
+            self._view[self._fill:self._fill + n] = src[pos:pos + n]
+            self._fill += n
+            pos += n
+            if self._fill == self.chunk_bytes:
+                chunks.append(bytes(self._buf))
+                self._fill = 0
+        return chunks
+
+    def flush(self) -> Optional[bytes]:
+        """Return the partial chunk, if any, and reset."""
+        if not self._fill:
+            return None
+        chunk = bytes(self._view[:self._fill])
+        self._fill = 0
+        return chunk
+
+
+class DropOldestQueue:
+    """
+    Bounded asyncio queue that never blocks the producer: when full, the
+    oldest item is discarded to make room.
+    """
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put_nowait(self, item) -> bool:
+        """Queue `item`; returns True if an older item was dropped for it."""
+        dropped = self._queue.full()
+        if dropped:
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(item)
+        return dropped
+
+    async def get(self):
+        return await self._queue.get()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
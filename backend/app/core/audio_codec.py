@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """
+    Outbound TTS audio format. `encoding` and `sample_rate` are passed to
+    Aura as-is, so switching formats costs nothing on the synthesis path.
+    """
+    name: str
+    encoding: str
+    sample_rate: int
+
+    @property
+    def sample_width(self) -> int:
+        return 2 if self.encoding == "linear16" else 1
+
+    @property
+    def bytes_per_second(self) -> int:
+        return self.sample_rate * self.sample_width
+
+    def frame_bytes(self, ms: int) -> int:
+        """Size of `ms` of audio, rounded down to whole samples."""
+        size = self.bytes_per_second * ms // 1000
+        return size - size % self.sample_width
+
+
+# What clients can ask for with ?audio_format=. Sizes per second of speech:
+# 48 KB (default), 32 KB, 16 KB, 8 KB.
+AUDIO_FORMATS = {
+    fmt.name: fmt
+    for fmt in (
+        AudioFormat("linear16", "linear16", 24000),
+        AudioFormat("linear16_16k", "linear16", 16000),
+        AudioFormat("linear16_8k", "linear16", 8000),
+        AudioFormat("mulaw", "mulaw", 8000),
+    )
+}
+
+DEFAULT_AUDIO_FORMAT = AUDIO_FORMATS["linear16"]
+
+
+def resolve_audio_format(name: Optional[str]) -> AudioFormat:
+    """Format for a client request; unknown or missing names get the default."""
+    return AUDIO_FORMATS.get(name or "", DEFAULT_AUDIO_FORMAT)
+
+
+def transcode(pcm: bytes, src_rate: int, fmt: AudioFormat) -> bytes:
+    """
+    Convert mono int16 PCM at `src_rate` into `fmt`. Used for audio that was
+    synthesized before the client's format was known (the warm greeting).
+    """
+    samples = np.frombuffer(pcm[: len(pcm) - len(pcm) % 2], dtype=np.int16)
+    if src_rate != fmt.sample_rate:
+        samples = resample(samples, src_rate, fmt.sample_rate)
+    if fmt.encoding == "mulaw":
+        return mulaw_encode(samples)
+    return samples.tobytes()
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Linear-interpolation resampler. When downsampling, a moving-average
+    filter first knocks down content above the new Nyquist rate.
+    """
+    if samples.size == 0 or src_rate == dst_rate:
+        return samples
+
+    x = samples.astype(np.float32)
+    if dst_rate < src_rate:
+        width = int(round(src_rate / dst_rate))
+        if width > 1:
+            x = np.convolve(x, np.full(width, 1.0 / width, dtype=np.float32), mode="same")
+
+    n_out = int(samples.size * dst_rate / src_rate)
+    positions = np.arange(n_out, dtype=np.float64) * (src_rate / dst_rate)
+    out = np.interp(positions, np.arange(samples.size), x)
+    return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+
+
+_MULAW_BIAS = 0x21
+_MULAW_CLIP = 8159
+
+
+def mulaw_encode(samples: np.ndarray) -> bytes:
+    """G.711 μ-law encode int16 samples, one byte per sample."""
+    x = samples.astype(np.int32) >> 2          # G.711 works on 14-bit samples
+    mask = np.where(x < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(x), _MULAW_CLIP) + _MULAW_BIAS
+
+    # Segment = bit length of the biased magnitude above 6 bits
+    _, bits = np.frexp(magnitude)
+    segment = np.maximum(bits.astype(np.int32) - 6, 0)
+    code = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    code = np.where(segment >= 8, 0x7F, code)
+
+    return (code ^ mask).astype(np.uint8).tobytes()
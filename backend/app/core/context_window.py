@@ -0,0 +1,85 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from app.config import settings
+
+
+def estimate_tokens(message: dict) -> int:
+    """Cheap token estimate (~4 chars per token plus per-message overhead)."""
+    return len(message.get("content") or "") // 4 + 4
+
+
+class ContextWindow:
+    """
+    Builds the message list sent to the LLM on each turn.
+
+    `history` stays the full transcript (it is what gets persisted); the LLM
+    only sees the system prompt, a rolling summary of older turns and the
+    most recent turns. Summaries are computed in the background, so building
+    the context never waits on the LLM.
+    """
+
+    def __init__(
+        self,
+        history: list,
+        summarize: Callable[[str, list], Awaitable[Optional[str]]],
+        recent_turns: int = settings.CONTEXT_RECENT_TURNS,
+        token_budget: int = settings.CONTEXT_TOKEN_BUDGET,
+        summary_batch: int = settings.CONTEXT_SUMMARY_BATCH,
+    ):
+        self.history = history
+        self._summarize_turns = summarize
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.summary_batch = summary_batch
+
+        self.summary = ""
+        # history[0] is the system prompt; turns before this index are in the summary
+        self._summarized_upto = 1
+        self._summary_task: Optional[asyncio.Task] = None
+
+    def messages(self) -> list:
+        turns = self.history[self._summarized_upto:]
+
+        # The last `recent_turns` are always kept verbatim. Older turns that
+        # are not summarized yet are added newest-first while they fit the budget.
+        keep = turns[-self.recent_turns:] if self.recent_turns > 0 else []
+        used = sum(estimate_tokens(m) for m in keep)
+        older = turns[:len(turns) - len(keep)]
+        for message in reversed(older):
+            used += estimate_tokens(message)
+            if used > self.token_budget:
+                break
+            keep.insert(0, message)
+
+        messages = [self.history[0]]
+        if self.summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the interview so far:\n{self.summary}"
+            })
+        messages.extend(keep)
+
+        self._maybe_summarize()
+        return messages
+
+    def _maybe_summarize(self) -> None:
+        if self._summary_task and not self._summary_task.done():
+            return
+
+        end = len(self.history) - self.recent_turns
+        if end - self._summarized_upto < self.summary_batch:
+            return
+
+        turns = self.history[self._summarized_upto:end]
+        self._summary_task = asyncio.create_task(self._summarize(turns, end))
+
+    async def _summarize(self, turns: list, end: int) -> None:
+        summary = await self._summarize_turns(self.summary, turns)
+        if summary:
+            self.summary = summary
+            self._summarized_upto = end
+
+    def close(self) -> None:
+        if self._summary_task:
+            self._summary_task.cancel()
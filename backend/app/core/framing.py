@@ -0,0 +1,102 @@
+import json
+import struct
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Iterator, List
+
+# Binary websocket protocol (?protocol=framed). Every frame starts with
+#
+#   version:u8  type:u8  seq:u32  ref:u16   (network byte order)
+#
+# followed by the payload. `seq` is the sender's sequence number (for ACK
+# frames: the highest seq the client has received). `ref` is
+# frame-specific: the sentence id for AUDIO / SENTENCE, the role for
+# TRANSCRIPT, 0 otherwise.
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct("!BBIH")
+_LENGTH = struct.Struct("!I")
+
+
+class FrameType(IntEnum):
+    AUDIO = 1        # PCM / mu-law bytes (mic audio from the client)
+    SENTENCE = 2     # UTF-8 text of the sentence the next AUDIO frames belong to
+    TRANSCRIPT = 3   # UTF-8 transcript line, role in `ref`
+    CONTROL = 4      # UTF-8 JSON control message, same shape as the JSON protocol
+    ACK = 5          # client -> server, no payload
+    BATCH = 6        # length-prefixed frames sent in a single websocket message
+
+
+ROLE_CODES = {"user": 0, "assistant": 1}
+ROLE_NAMES = {code: role for role, code in ROLE_CODES.items()}
+
+
+class FrameError(ValueError):
+    pass
+
+
+@dataclass
+class Frame:
+    type: FrameType
+    seq: int
+    ref: int
+    payload: bytes
+
+    def json(self) -> dict:
+        return json.loads(self.payload)
+
+
+def encode_frame(frame_type: FrameType, seq: int, payload: bytes = b"", ref: int = 0) -> bytes:
+    return HEADER.pack(PROTOCOL_VERSION, frame_type, seq & 0xFFFFFFFF, ref & 0xFFFF) + payload
+
+
+def encode_message(seq: int, message: dict) -> bytes:
+    """Encode a JSON-protocol message ({"type": "transcript" | "control", ...})."""
+    if message.get("type") == "transcript":
+        return encode_frame(
+            FrameType.TRANSCRIPT,
+            seq,
+            message["content"].encode("utf-8"),
+            ROLE_CODES.get(message["role"], 0),
+        )
+    return encode_frame(FrameType.CONTROL, seq, json.dumps(message).encode("utf-8"))
+
+
+def encode_batch(frames: List[bytes]) -> bytes:
+    parts = [HEADER.pack(PROTOCOL_VERSION, FrameType.BATCH, 0, 0)]
+    for frame in frames:
+        parts.append(_LENGTH.pack(len(frame)))
+        parts.append(frame)
+    return b"".join(parts)
+
+
+def decode_frame(data: bytes) -> Frame:
+    if len(data) < HEADER.size:
+        raise FrameError(f"short frame ({len(data)} bytes)")
+    version, frame_type, seq, ref = HEADER.unpack_from(data)
+    if version != PROTOCOL_VERSION:
+        raise FrameError(f"unsupported protocol version {version}")
+    try:
+        frame_type = FrameType(frame_type)
+    except ValueError:
+        raise FrameError(f"unknown frame type {frame_type}")
+    return Frame(frame_type, seq, ref, data[HEADER.size:])
+
+
+def iter_frames(data: bytes) -> Iterator[Frame]:
+    """Decode one websocket message, flattening BATCH frames."""
+    frame = decode_frame(data)
+    if frame.type != FrameType.BATCH:
+        yield frame
+        return
+
+    body = memoryview(frame.payload)
+    pos = 0
+    while pos < len(body):
+        if pos + _LENGTH.size > len(body):
+            raise FrameError("truncated batch")
+        (length,) = _LENGTH.unpack_from(body, pos)
+        pos += _LENGTH.size
+        if pos + length > len(body):
+            raise FrameError("truncated batch")
+        yield decode_frame(bytes(body[pos:pos + length]))
+        pos += length
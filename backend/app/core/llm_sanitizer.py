@@ -1,37 +1,167 @@
 import re
 
 END_TOKEN = "[END_INTERVIEW]"
+
 PLACEHOLDER = "__END_INTERVIEW__"
 
+# One bracketed / starred span (non-nested, shortest match) or a stray
+# symbol. The lookahead keeps END_TOKEN from being treated as a [...] span,
+# and a [...] span cannot contain "[", so it never runs on into END_TOKEN.
+_SPAN = (
+    r"(?:(?!\[END_INTERVIEW\])"
+    r"(?:\([^)]*\)|\[[^\[\]]*\]|\{[^}]*\}|<[^>]*>|\*[^*]*\*|[\[\]\(\)\{\}\*<>]))"
+)
+
+# Single pass: END_TOKEN (kept), a run of spans together with the
+# whitespace around them, or a whitespace run. The leading lookahead lets
+# ordinary characters fail without trying every alternative.
+_PATTERN = re.compile(
+    rf"(?=[\s\[\]\(\)\{{\}}\*<>])"
+    rf"(?:\[END_INTERVIEW\]|\s*{_SPAN}(?:\s*{_SPAN})*\s*|\s{{2,}})"
+)
+
+# Scanner for the streaming sanitizer: complete spans, or a bare opener
+# whose closer has not arrived yet
+_OPEN_SCAN = re.compile(
+    r"(?=[\(\[\{<\*])"
+    r"(?:\[END_INTERVIEW\]|\([^)]*\)|\[[^\[\]]*\]|\{[^}]*\}|<[^>]*>|\*[^*]*\*|[\(\[\{<\*])"
+)
+
+
+_SPAN_ONLY = re.compile(_SPAN)
+_SYMBOL = re.compile(r"[\[\]\(\)\{\}\*<>]")
+
+# Sentence end after an unclosed opener: spans don't usually cross one
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s|\n")
+
+
+class _Tangled(Exception):
+    """The text has stray, nested or crossing symbols."""
+
+
+def _replace(match: re.Match) -> str:
+    text = match.group()
+    if text == END_TOKEN:
+        return text
+    # What is left once the spans are gone is whitespace, which is kept
+    # as is if it is a single character and collapsed to a space otherwise
+    rest = _SPAN_ONLY.sub("", text)
+    return rest if len(rest) < 2 else " "
+
+
+def _replace_flat(match: re.Match) -> str:
+    # Each removed span must be a matched pair with no symbols inside
+    text = match.group()
+    if text != END_TOKEN:
+        for span in _SPAN_ONLY.findall(text):
+            if len(span) < 2 or _SYMBOL.search(span, 1, len(span) - 1):
+                raise _Tangled
+    return _replace(match)
+
+
+def _clean_in_passes(text: str) -> str:
+    """One pass per span kind, in a fixed order; unmatched symbols last."""
+    text = text.replace(END_TOKEN, PLACEHOLDER)
+    text = re.sub(r"\([^)]*\)", "", text)
+    text = re.sub(r"\[[^\]]*\]", "", text)
+    text = re.sub(r"\{[^}]*\}", "", text)
+    text = re.sub(r"<[^>]*>", "", text)
+    text = re.sub(r"\*[^*]*\*", "", text)
+    text = _SYMBOL.sub("", text)
+    text = text.replace(PLACEHOLDER, END_TOKEN)
+    return re.sub(r"\s{2,}", " ", text)
+
+
+def _clean(text: str) -> str:
+    # Ordinary text (no symbols, or only flat matched pairs) takes the
+    # single pass; anything else gets the pass-per-kind rules, which
+    # decide how stray and overlapping symbols pair up
+    try:
+        return _PATTERN.sub(_replace_flat, text)
+    except _Tangled:
+        return _clean_in_passes(text)
+
+
 def sanitize_llm_output(text: str) -> str:
+    """
+    Strip stage directions and markup from LLM text before TTS: (...),
+    [...], {...}, <...> and *...* spans with their content, any leftover
+    bracket symbols, and repeated whitespace. END_TOKEN is preserved
+    unless it sits inside a span.
+    """
     if not text:
         return text
+    return _clean(text).strip()
 
-    # Preserve END_INTERVIEW
-    text = text.replace(END_TOKEN, PLACEHOLDER)
 
-    # Remove (...) including content
-    text = re.sub(r"\([^)]*\)", "", text)
+class StreamingSanitizer:
+    """
+    sanitize_llm_output over a token stream.
 
-    # Remove [...] including content
-    text = re.sub(r"\[[^\]]*\]", "", text)
+    feed() returns the part of the text seen so far that is already known
+    to be clean. An opener whose closer has not arrived yet (which may also
+    be the start of END_TOKEN) is held back together with everything after
+    it, as is trailing whitespace. A span still open at the next sentence
+    end, or after `max_span` characters, is treated as a stray symbol, so
+    one unmatched "*" or "<" holds back at most the sentence it is in.
+    """
 
-    # Remove {...} including content
-    text = re.sub(r"\{[^}]*\}", "", text)
+    def __init__(self, max_span: int = 200):
+        self.max_span = max_span
+        self._pending = ""
+        self._started = False
+        self._space_owed = False
 
-    # Remove <...> including content
-    text = re.sub(r"<[^>]*>", "", text)
+    def feed(self, chunk: str) -> str:
+        text = self._pending + chunk
+        safe = len(text)
 
-    # Remove *...* including content
-    text = re.sub(r"\*[^*]*\*", "", text)
+        for match in _OPEN_SCAN.finditer(text):
+            if len(match.group()) == 1:
+                if (
+                    len(text) - match.start() <= self.max_span
+                    and not _SENTENCE_END.search(text, match.end())
+                ):
+                    safe = match.start()
+                    break
+                # Gave up waiting for the closer: drop the opener
+                text = text[:match.start()] + text[match.start() + 1:]
+                return self._feed_from(text)
 
-    # Remove leftover unmatched symbols
-    text = re.sub(r"[\[\]\(\)\{\}\*<>]", "", text)
+        return self._emit(text, safe)
 
-    # Restore END_INTERVIEW
-    text = text.replace(PLACEHOLDER, END_TOKEN)
+    def flush(self) -> str:
+        """End of stream: unclosed openers are dropped as stray symbols."""
+        clean = self._emit(self._pending, len(self._pending))
+        self._pending = ""
+        self._space_owed = False
+        return clean
+
+    def _feed_from(self, text: str) -> str:
+        self._pending = ""
+        return self.feed(text)
+
+    def _emit(self, text: str, safe: int) -> str:
+        # Trailing whitespace may still merge with a following span
+        safe = len(text[:safe].rstrip())
+        self._pending = text[safe:]
+        clean = text[:safe]
+        if END_TOKEN in clean:
+            # Cleaned piecewise around END_TOKEN so no span can swallow it
+            clean = END_TOKEN.join(_clean(part) for part in clean.split(END_TOKEN))
+        else:
+            clean = _clean(clean)
 
-    # Normalize whitespace
-    text = re.sub(r"\s{2,}", " ", text)
+        if not self._started:
+            clean = clean.lstrip()
+        body = clean.rstrip()
+        if not body:
+            self._space_owed = self._space_owed or (self._started and bool(clean))
+            return ""
 
-    return text.strip()
+        # A space left by a removed span at the end is owed to the next emit
+        if self._space_owed and not clean[:1].isspace():
+            body = " " + body
+        self._space_owed = len(clean.rstrip()) < len(clean)
+        self._started = True
+        return body
@@ -0,0 +1,76 @@
+import logging
+import queue
+import sys
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.config import settings
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s [%(session_id)s] %(message)s"
+
+# Interview being served by the current task; tasks spawned for a session
+# inherit it, so every line they log is tagged without passing it around.
+session_id_var: ContextVar[str] = ContextVar("session_id", default="-")
+
+_listener: Optional[QueueListener] = None
+_sample_counts: Dict[str, int] = {}
+
+
+class SessionContextFilter(logging.Filter):
+    """Stamps records with the session id while still on the logging task."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "session_id"):
+            record.session_id = session_id_var.get()
+        return True
+
+
+def setup_logging(level: str = settings.LOG_LEVEL) -> None:
+    """
+    Route the `app` loggers through a queue. Callers on the event loop only
+    format the record and enqueue it; a QueueListener thread does the
+    actual stdout writes.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    handler = QueueHandler(records)
+    handler.addFilter(SessionContextFilter())
+
+    logger = logging.getLogger("app")
+    logger.setLevel(level)
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    _listener = QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Drain queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def bind_session(session_id: str) -> None:
+    """Tag log lines from the current task (and tasks it spawns) with `session_id`."""
+    session_id_var.set(session_id)
+
+
+def sampled(key: str, every: int = settings.LOG_SAMPLE_EVERY) -> bool:
+    """
+    True for the 1st, (every+1)th, ... call per `key`. Used for events that
+    fire per token or per audio frame, where logging each one would cost
+    more than the work being logged.
+    """
+    count = _sample_counts.get(key, 0)
+    _sample_counts[key] = count + 1
+    return every <= 1 or count % every == 0
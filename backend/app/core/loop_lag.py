@@ -0,0 +1,48 @@
+import asyncio
+from typing import Optional
+
+from app.config import settings
+from app.core.tracing import LatencyHistogram
+
+LOOP_LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how late a sleep of `interval` seconds wakes
+    up. Anything blocking the loop (sync I/O, CPU work) shows up here for
+    every interview on the worker.
+    """
+
+    def __init__(self, interval: float = settings.LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.histogram = LatencyHistogram(LOOP_LAG_BUCKETS_MS)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - started - self.interval) * 1000)
+            self.last_ms = lag_ms
+            self.max_ms = max(self.max_ms, lag_ms)
+            self.histogram.observe(lag_ms)
+
+
+loop_lag = LoopLagMonitor()
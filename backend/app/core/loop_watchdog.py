@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.config import settings
+from app.core.metrics import runtime_stats
+
+logger = logging.getLogger(__name__)
+
+
+def child_task_name(suffix: str) -> str:
+    """
+    Name for a task spawned from the current one, e.g. "ws:<session>:tts".
+    Interview tasks carry the session id this way, so a stall report can
+    say which interview the blocking code was serving.
+    """
+    try:
+        parent = asyncio.current_task()
+    except RuntimeError:
+        parent = None
+    return f"{parent.get_name()}:{suffix}" if parent else suffix
+
+
+class LoopWatchdog:
+    """
+    Opt-in stall detector for the event loop.
+
+    A heartbeat task stamps the time every `poll` seconds; a daemon thread
+    checks the stamp. If the loop has not run for `threshold_ms`, the
+    thread grabs the loop thread's current stack (sys._current_frames)
+    and the running task's name, and logs them as a warning once per
+    stall (counted in runtime_stats["loop_stalls"]). The stack
+    is taken while the loop is still blocked, so it points at the
+    offending call rather than at whatever ran afterwards.
+    """
+
+    def __init__(self, threshold_ms: float = settings.LOOP_WATCHDOG_THRESHOLD_MS):
+        self.threshold = threshold_ms / 1000.0
+        self.poll = max(0.01, self.threshold / 4)
+        self.stalls = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._beat = time.monotonic()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Call from the event loop thread."""
+        if self._thread:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="loop-watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info("Watching for stalls over %.0fms", self.threshold * 1000)
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.poll)
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stop.wait(self.poll):
+            stalled = time.monotonic() - self._beat - self.poll
+            if stalled < self.threshold:
+                reported = False
+                continue
+            if not reported:
+                reported = True
+                self._report(stalled)
+
+    def _report(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = _format_task_stack(frame) if frame else "  <no frame>\n"
+        try:
+            task = asyncio.current_task(self._loop)
+        except Exception:
+            task = None
+        task_name = task.get_name() if task else "<no task>"
+
+        self.stalls += 1
+        runtime_stats["loop_stalls"] += 1
+        logger.warning(
+            "Event loop blocked for %.0fms+ in task %s\n%s",
+            stalled * 1000, task_name, stack.rstrip(),
+        )
+
+
+def _format_task_stack(frame) -> str:
+    """Stack of the loop thread, without the asyncio scheduler frames above the task."""
+    frames = traceback.extract_stack(frame)
+    for i in range(len(frames) - 1, -1, -1):
+        if frames[i].filename.endswith(("asyncio/events.py", "asyncio\\events.py")):
+            frames = frames[i + 1:]
+            break
+    return "".join(traceback.format_list(frames))
+
+
+loop_watchdog = LoopWatchdog()
@@ -0,0 +1,86 @@
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Process-wide counters and in-flight gauges for the realtime path
+runtime_stats = {
+    "llm_in_flight": 0,
+    "tts_in_flight": 0,
+    "llm_requests": 0,
+    "tts_requests": 0,
+    "groq_fallbacks": 0,
+    "tts_timeouts": 0,
+    "tts_errors": 0,
+    "audio_chunks_dropped": 0,
+    "loop_stalls": 0,
+}
+
+Labels = Optional[Dict[str, str]]
+
+
+class PrometheusText:
+    """
+    Writer for the Prometheus text exposition format (0.0.4). Hand-rolled
+    so a scrape only formats numbers that are already in memory.
+    """
+
+    def __init__(self, prefix: str = "evaluet_"):
+        self.prefix = prefix
+        self._lines: List[str] = []
+
+    def gauge(self, name: str, help_text: str, value: float, labels: Labels = None) -> None:
+        self.family(name, "gauge", help_text, [(labels, value)])
+
+    def counter(self, name: str, help_text: str, value: float, labels: Labels = None) -> None:
+        self.family(name, "counter", help_text, [(labels, value)])
+
+    def family(
+        self,
+        name: str,
+        kind: str,
+        help_text: str,
+        samples: Iterable[Tuple[Labels, float]],
+    ) -> None:
+        name = self.prefix + name
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            self._lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histograms(self, name: str, help_text: str, series: Iterable[Tuple[Labels, object]]) -> None:
+        """`series` yields (labels, LatencyHistogram) pairs."""
+        name = self.prefix + name
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} histogram")
+        for labels, hist in series:
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                self._lines.append(
+                    f"{name}_bucket{_labels({**(labels or {}), 'le': _number(bound)})} {cumulative}"
+                )
+            self._lines.append(f"{name}_bucket{_labels({**(labels or {}), 'le': '+Inf'})} {hist.count}")
+            self._lines.append(f"{name}_sum{_labels(labels)} {_number(hist.sum)}")
+            self._lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,166 @@
+import re
+import time
+from typing import Callable, Iterator, List, Optional
+
+from app.config import settings
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed
+# by whitespace, or a line break. "3.5", "Node.js" and URLs never match
+# because nothing but whitespace may follow the dot.
+_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s+|\n\s*")
+
+# Cheap pre-check on the newest token (plus a few chars of lookbehind)
+_CANDIDATE = re.compile(r"[.!?][\"')\]]*\s|\n")
+
+# Clause end, used to cut long or slow-to-arrive first chunks
+_CLAUSE = re.compile(r"[,;:—]\s+")
+
+_ABBREVIATIONS = {
+    "e.g", "i.e", "vs", "mr", "mrs", "ms", "dr", "prof", "sr", "jr",
+    "approx", "dept", "fig", "inc", "ltd", "u.s", "a.m", "p.m",
+}
+
+# Also ordinary words at the end of a sentence ("the answer is no."), so
+# they only count when the next word starts with a digit or lowercase
+# letter ("No. 5", "est. 1998"), or for "st", a capital ("St. Louis")
+_CONTEXT_ABBREVIATIONS = {"no", "co", "est", "st"}
+
+
+class SentenceSegmenter:
+    """
+    Streaming splitter between LLM tokens and TTS requests.
+
+    Tokens are appended to a list and only joined when the newest token
+    could complete a sentence, so pushes are O(1) amortized. Chunks shorter
+    than `min_chars` are merged with the next sentence, chunks longer than
+    `max_chars` are cut at a clause or word boundary, and if the first chunk
+    of a reply has not completed after `first_clause_ms` it is cut at the
+    first clause instead, so audio can start.
+    """
+
+    def __init__(
+        self,
+        min_chars: int = settings.SEGMENT_MIN_CHARS,
+        max_chars: int = settings.SEGMENT_MAX_CHARS,
+        first_clause_ms: float = settings.SEGMENT_FIRST_CLAUSE_MS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_chars = min_chars
+        self.max_chars = max(max_chars, min_chars + 1)
+        self.first_clause_s = first_clause_ms / 1000.0
+        self._clock = clock
+
+        self._pieces: List[str] = []
+        self._size = 0
+        self._tail = ""                  # last few chars, for the pre-check
+        self._started: Optional[float] = None
+        self._emitted = False
+
+    def push(self, token: str) -> List[str]:
+        """Add a token; return the chunks it completed (usually none)."""
+        if not token:
+            return []
+        if self._started is None:
+            self._started = self._clock()
+
+        self._pieces.append(token)
+        self._size += len(token)
+        window = self._tail + token
+        self._tail = window[-4:]
+
+        if (
+            self._size > self.max_chars
+            or _CANDIDATE.search(window)
+            or self._first_chunk_overdue()
+        ):
+            return self._split()
+        return []
+
+    def flush(self) -> Optional[str]:
+        """End of stream: whatever is left, as one chunk."""
+        text = "".join(self._pieces).strip()
+        self._pieces = []
+        self._size = 0
+        self._tail = ""
+        return text or None
+
+    def _first_chunk_overdue(self) -> bool:
+        return (
+            not self._emitted
+            and self._size >= self.min_chars
+            and self._clock() - self._started >= self.first_clause_s
+        )
+
+    def _split(self) -> List[str]:
+        text = "".join(self._pieces)
+        chunks = []
+        start = 0
+
+        for end in self._boundaries(text):
+            if len(text[start:end].strip()) >= self.min_chars:
+                chunks.append(text[start:end].strip())
+                start = end
+
+        rest = text[start:]
+        if not chunks and self._first_chunk_overdue():
+            cut = self._clause_cut(rest, len(rest))
+            if cut:
+                chunks.append(rest[:cut].strip())
+                rest = rest[cut:]
+
+        while len(rest) > self.max_chars:
+            cut = self._clause_cut(rest, self.max_chars) or _word_cut(rest, self.max_chars)
+            chunks.append(rest[:cut].strip())
+            rest = rest[cut:]
+
+        self._pieces = [rest] if rest else []
+        self._size = len(rest)
+        if chunks:
+            self._emitted = True
+        return chunks
+
+    def _boundaries(self, text: str) -> Iterator[int]:
+        for match in _BOUNDARY.finditer(text):
+            punct = match.group().rstrip()
+            if punct == "." and _is_abbreviation(text, match.start(), match.end()):
+                continue
+            yield match.end()
+
+    def _clause_cut(self, text: str, limit: int) -> int:
+        """End of the last clause within `limit` that is at least min_chars long, or 0."""
+        cut = 0
+        for match in _CLAUSE.finditer(text, 0, limit):
+            if match.start() + 1 >= self.min_chars:
+                cut = match.end()
+        return cut
+
+
+def _is_abbreviation(text: str, dot: int, after: int) -> bool:
+    start = dot
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    word = text[start:dot].lstrip("\"'([")
+
+    if word.lower() in _ABBREVIATIONS:
+        return True
+    if word.lower() in _CONTEXT_ABBREVIATIONS:
+        if after == len(text):
+            return True  # next word not streamed yet; decided on a later push
+        following = text[after]
+        return (
+            following.isdigit()
+            or following.islower()
+            or (word.lower() == "st" and following.isupper())
+        )
+    # Initials ("J. Smith")
+    if len(word) == 1 and word.isupper():
+        return True
+    # Numbered list items ("1. First point")
+    if word.isdigit() and (start == 0 or text[start - 1] == "\n"):
+        return True
+    return False
+
+
+def _word_cut(text: str, limit: int) -> int:
+    cut = text.rfind(" ", 0, limit)
+    return cut + 1 if cut > 0 else limit
@@ -0,0 +1,164 @@
+import bisect
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.config import settings
+
+# Stages of one conversational turn, in pipeline order. Each is recorded
+# as milliseconds since Flux reported EndOfTurn.
+TURN_STAGES = (
+    "end_of_turn",      # EndOfTurn received from Flux
+    "llm_request",      # Groq stream requested (or speculative one adopted)
+    "first_token",      # first LLM token reached the TTS splitter
+    "first_sentence",   # first chunk handed to TTS
+    "tts_request",      # first Aura request started
+    "first_audio",      # first audio bytes back from Aura (or the cache)
+    "last_audio",       # last audio frame sent to the client
+)
+
+# Per-provider durations derived from the stages
+TURN_DURATIONS = {
+    "llm_first_token": ("llm_request", "first_token"),
+    "tts_first_audio": ("tts_request", "first_audio"),
+    "playback_send": ("first_audio", "last_audio"),
+}
+
+# Histogram bucket upper bounds (ms)
+LATENCY_BUCKETS_MS = (
+    10, 25, 50, 100, 150, 200, 300, 400, 500, 650, 800, 1000, 1250, 1500,
+    2000, 2500, 3000, 4000, 5000, 7500, 10000, 15000, 30000,
+)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram; quantiles are interpolated within a bucket and
+    never reported above the largest value observed.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+        self.max = max(self.max, value_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.buckets[i - 1] if i else 0.0
+                if i == len(self.buckets):
+                    return float(max(lower, self.max))
+                value = lower + (self.buckets[i] - lower) * (rank - seen) / n
+                return min(value, self.max)
+            seen += n
+        return float(min(self.buckets[-1], self.max))
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+# Per-process histograms, keyed by stage / duration name
+turn_latency: Dict[str, LatencyHistogram] = {
+    name: LatencyHistogram() for name in (*TURN_STAGES[1:], *TURN_DURATIONS)
+}
+
+
+@dataclass
+class TurnTrace:
+    session_id: str
+    voice_model: str
+    turn: int
+    started: float                      # time.monotonic() at EndOfTurn
+    speculative: bool = False
+    marks: Dict[str, float] = field(default_factory=dict)
+
+    def mark(self, stage: str, overwrite: bool = False) -> None:
+        if overwrite or stage not in self.marks:
+            self.marks[stage] = round((time.monotonic() - self.started) * 1000, 1)
+
+    def durations(self) -> Dict[str, float]:
+        return {
+            name: round(self.marks[end] - self.marks[start], 1)
+            for name, (start, end) in TURN_DURATIONS.items()
+            if start in self.marks and end in self.marks
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "voice_model": self.voice_model,
+            "turn": self.turn,
+            "speculative": self.speculative,
+            "stages": dict(self.marks),
+            "durations": self.durations(),
+        }
+
+
+# The turn being served by the current task. Tasks spawned while a turn is
+# active (TTS synthesis, the speak task) inherit it, so deep code can call
+# mark() without a trace being passed around.
+_current_trace: ContextVar[Optional[TurnTrace]] = ContextVar("turn_trace", default=None)
+
+
+def start_turn(
+    session_id: str,
+    voice_model: str,
+    turn: int,
+    ended_at: Optional[float] = None,
+) -> Optional[TurnTrace]:
+    if not settings.TRACE_ENABLED:
+        return None
+    trace = TurnTrace(session_id, voice_model, turn, ended_at or time.monotonic())
+    trace.marks["end_of_turn"] = 0.0
+    _current_trace.set(trace)
+    return trace
+
+
+def mark(stage: str, overwrite: bool = False) -> None:
+    """Record `stage` on the active turn, if any. First occurrence wins."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.mark(stage, overwrite)
+
+
+def finish_turn(trace: Optional[TurnTrace]) -> None:
+    """Close the active turn and add it to the process histograms."""
+    _current_trace.set(None)
+    if trace is None:
+        return
+    for stage, value in trace.marks.items():
+        if stage in turn_latency:
+            turn_latency[stage].observe(value)
+    for name, value in trace.durations().items():
+        turn_latency[name].observe(value)
+
+
+def latency_summary() -> Dict[str, dict]:
+    """p50/p95/p99 (ms) per stage and per derived duration."""
+    return {name: hist.summary() for name, hist in turn_latency.items()}
+
+
+def format_trace(trace: TurnTrace) -> str:
+    parts: List[str] = [f"{stage}={trace.marks[stage]:.0f}" for stage in TURN_STAGES if stage in trace.marks]
+    return (
+        f"[Trace] {trace.session_id} turn={trace.turn} voice={trace.voice_model} "
+        f"speculative={trace.speculative} " + " ".join(parts)
+    )
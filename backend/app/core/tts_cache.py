@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Optional, Set
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TTSCache:
+    """
+    Content-addressed cache for synthesized speech.
+
+    Keys are a SHA-256 of (voice_model, audio format, text), so identical
+    phrases spoken by the same voice in the same format share one entry
+    across sessions. The memory tier is an LRU capped in bytes. The
+    optional disk tier keeps entries across restarts, but only those put
+    with `persist` (fixed phrases such as greetings, never interview
+    replies); it is an LRU too, capped at `disk_max_bytes`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_entry_bytes: int,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 0,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.disk_dir = disk_dir or None
+        self.disk_max_bytes = disk_max_bytes
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+        self._disk_writes: Set[asyncio.Task] = set()
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.size_bytes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(voice_model: str, text: str, audio_format: str = "linear16") -> str:
+        return hashlib.sha256(
+            f"{voice_model}\n{audio_format}\n{text.strip()}".encode("utf-8")
+        ).hexdigest()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+        if self.disk_dir:
+            audio = await asyncio.to_thread(self._read_disk, key)
+            if audio is not None:
+                self.disk_hits += 1
+                self._remember(key, audio)
+                return audio
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, audio: bytes, persist: bool = False) -> None:
+        """
+        Cache `audio`. With `persist` it is also written to the disk tier,
+        in the background, so callers never wait on file I/O.
+        """
+        if not audio or len(audio) > self.max_entry_bytes:
+            return
+        self._remember(key, audio)
+        if persist and self.disk_dir:
+            task = asyncio.create_task(
+                asyncio.to_thread(self._write_disk, key, audio), name="tts-cache-write"
+            )
+            self._disk_writes.add(task)
+            task.add_done_callback(self._disk_writes.discard)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size_bytes -= len(old)
+        self._entries[key] = audio
+        self.size_bytes += len(audio)
+
+        while self.size_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.audio")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)   # mtime is the disk tier's LRU order
+            return audio
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Disk read error: %s", e)
+            return None
+
+    def _write_disk(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Disk write error: %s", e)
+            return
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        """Delete least recently used files until the disk tier fits its cap."""
+        try:
+            with os.scandir(self.disk_dir) as it:
+                files = [
+                    (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                    for entry in it
+                    if entry.name.endswith(".audio")
+                ]
+        except OSError as e:
+            logger.warning("Disk scan error: %s", e)
+            return
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass   # already evicted by a concurrent write
+            total -= size
+
+
+tts_cache = TTSCache(
+    max_bytes=settings.TTS_CACHE_MAX_BYTES,
+    max_entry_bytes=settings.TTS_CACHE_MAX_ENTRY_BYTES,
+    disk_dir=settings.TTS_CACHE_DIR,
+    disk_max_bytes=settings.TTS_CACHE_DISK_MAX_BYTES,
+)
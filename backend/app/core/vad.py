@@ -0,0 +1,107 @@
+from collections import deque
+from typing import Deque, List
+
+import numpy as np
+
+from app.config import settings
+
+# Process-wide counters across all sessions
+vad_stats = {"forwarded": 0, "suppressed": 0}
+
+
+class EnergyVAD:
+    """
+    Cheap speech gate for 16 kHz mono int16 PCM.
+
+    A frame counts as speech when its RMS energy is above the threshold and
+    its zero-crossing rate is not noise-like (very loud frames pass either
+    way). Speech frames, plus a hangover after them so Flux still hears the
+    silence it needs to close the turn, are forwarded. Sustained silence is
+    replaced by one frame every keepalive interval, and the last few silent
+    frames are held as pre-roll so speech onsets are not clipped.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        rms_threshold: float = settings.VAD_RMS_THRESHOLD,
+        zcr_max: float = settings.VAD_ZCR_MAX,
+        hangover_ms: float = settings.VAD_HANGOVER_MS,
+        preroll_ms: float = settings.VAD_PREROLL_MS,
+        keepalive_ms: float = settings.VAD_KEEPALIVE_MS,
+    ):
+        self.sample_rate = sample_rate
+        self.rms_threshold = rms_threshold
+        self.zcr_max = zcr_max
+        self.hangover_ms = hangover_ms
+        self.preroll_ms = preroll_ms
+        self.keepalive_ms = keepalive_ms
+
+        self.forwarded = 0
+        self.suppressed = 0
+
+        self._hangover_left_ms = 0.0
+        self._since_keepalive_ms = 0.0
+        self._preroll: Deque[bytes] = deque()
+        self._preroll_ms = 0.0
+
+    def is_speech(self, samples: np.ndarray) -> bool:
+        if samples.size == 0:
+            return False
+        x = samples.astype(np.float32)
+        rms = float(np.sqrt(np.mean(x * x)))
+        if rms < self.rms_threshold:
+            return False
+        signs = np.signbit(samples)
+        zcr = np.count_nonzero(signs[1:] != signs[:-1]) / samples.size
+        return zcr <= self.zcr_max or rms >= 2 * self.rms_threshold
+
+    def process(self, frame: bytes) -> List[bytes]:
+        """Frames to forward for one input frame (possibly none)."""
+        if len(frame) % 2:
+            # Not whole int16 samples; don't guess
+            self._drop_preroll()
+            return self._forward([frame])
+
+        samples = np.frombuffer(frame, dtype=np.int16)
+        duration_ms = samples.size * 1000.0 / self.sample_rate
+
+        if self.is_speech(samples):
+            self._hangover_left_ms = self.hangover_ms
+            self._since_keepalive_ms = 0.0
+            out = list(self._preroll) + [frame]
+            self._preroll.clear()
+            self._preroll_ms = 0.0
+            return self._forward(out)
+
+        if self._hangover_left_ms > 0:
+            self._hangover_left_ms -= duration_ms
+            return self._forward([frame])
+
+        self._since_keepalive_ms += duration_ms
+        if self._since_keepalive_ms >= self.keepalive_ms:
+            self._since_keepalive_ms = 0.0
+            # Held frames are older than this one; sending them at the next
+            # speech onset would put audio out of order
+            self._drop_preroll()
+            return self._forward([frame])
+
+        self._preroll.append(frame)
+        self._preroll_ms += duration_ms
+        while self._preroll_ms > self.preroll_ms and len(self._preroll) > 1:
+            dropped = self._preroll.popleft()
+            self._preroll_ms -= len(dropped) * 500.0 / self.sample_rate
+            self.suppressed += 1
+            vad_stats["suppressed"] += 1
+        return []
+
+    def _drop_preroll(self) -> None:
+        self.suppressed += len(self._preroll)
+        vad_stats["suppressed"] += len(self._preroll)
+        self._preroll.clear()
+        self._preroll_ms = 0.0
+
+    def _forward(self, frames: List[bytes]) -> List[bytes]:
+        self.forwarded += len(frames)
+        vad_stats["forwarded"] += len(frames)
+        return frames
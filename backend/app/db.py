@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings 
 
@@ -6,6 +8,9 @@ from app.config import settings
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
 )
 
 # 2. Create the Session factory
@@ -20,4 +25,50 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# 5. Enum values added after the first deploy (create_all never alters types)
+def upgrade_enums():
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ALTER TYPE session_status_enum ADD VALUE IF NOT EXISTS 'GENERATING'"))
+
+
+# 6. Async engine for the realtime and report paths (never blocks the event loop)
+def _async_url_and_args(database_url: str):
+    """
+    Map DATABASE_URL to its async driver. libpq-only query options
+    (sslmode, channel_binding) are not understood by asyncpg, so sslmode
+    is passed through connect_args instead.
+    """
+    url = make_url(database_url)
+    connect_args = {}
+
+    if url.get_backend_name() in ("postgresql", "postgres"):
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+        if sslmode and sslmode != "disable":
+            connect_args["ssl"] = sslmode
+        connect_args["command_timeout"] = settings.DB_COMMAND_TIMEOUT
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+
+    return url, connect_args
+
+
+_async_url, _async_connect_args = _async_url_and_args(settings.DATABASE_URL)
+
+async_engine = create_async_engine(
+    _async_url,
+    connect_args=_async_connect_args,
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
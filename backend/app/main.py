@@ -1,13 +1,25 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import interview as interview_router
 from app.routers import auth as auth_router
 from app.routers import websocket as websocket_router
-from app.db import engine, Base
-from app.models import (interview_sessions,interview_reports,users)
+from app.routers import metrics as metrics_router
+from app.db import engine, Base, upgrade_enums
+from app.models import (interview_sessions,interview_reports,users,report_jobs,interview_turns,turn_latencies)
+from app.services.report_queue import report_queue
+from app.core.loop_lag import loop_lag
+from app.core.loop_watchdog import loop_watchdog
+from app.core.log import setup_logging, shutdown_logging
+from app.services.pdf_service import start_parse_server
+from app.config import settings
+
+setup_logging()
 
 # Create DB Tables
 Base.metadata.create_all(bind=engine)
+upgrade_enums()
 
 app = FastAPI(title="Evaluet API")
 
@@ -23,10 +35,49 @@ app.add_middleware(
 )
 # -------------------------------------------
 
+# Background report workers
+@app.on_event("startup")
+async def start_report_queue():
+    await report_queue.start()
+
+@app.on_event("shutdown")
+async def stop_report_queue():
+    await report_queue.stop()
+
+# Resume parses fork from a server that has pypdf loaded
+@app.on_event("startup")
+async def start_pdf_parse_server():
+    await asyncio.to_thread(start_parse_server)
+
+# Event loop lag sampling for /metrics
+@app.on_event("startup")
+async def start_loop_lag():
+    loop_lag.start()
+
+@app.on_event("shutdown")
+async def stop_loop_lag():
+    await loop_lag.stop()
+
+# Opt-in: report what is blocking the event loop
+@app.on_event("startup")
+async def start_loop_watchdog():
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+
+@app.on_event("shutdown")
+async def stop_loop_watchdog():
+    await loop_watchdog.stop()
+
+# Registered last so records logged by the other shutdown hooks get written
+@app.on_event("shutdown")
+async def stop_logging():
+    shutdown_logging()
+
 # Include Routers
 app.include_router(interview_router.router, prefix="/api/interview", tags=["Interview"])
 app.include_router(auth_router.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(websocket_router.router, prefix="/ws", tags=["WebSocket"])
+app.include_router(metrics_router.router, tags=["Metrics"])
 
 @app.get("/")
 def health_check():
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db import Base
+
+class InterviewTurn(Base):
+    """
+    One transcript message, appended while the interview is running.
+    """
+    __tablename__ = "interview_turns"
+    __table_args__ = (
+        UniqueConstraint("session_id", "seq", name="uq_interview_turns_session_seq"),
+    )
+
+    turn_id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(
+        String,
+        ForeignKey("interview_sessions.session_id"),
+        index=True,
+        nullable=False
+    )
+
+    seq = Column(Integer, nullable=False)   # 0-based order within the session
+    role = Column(String, nullable=False)   # "user" | "assistant"
+    content = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
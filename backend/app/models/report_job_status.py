@@ -0,0 +1,7 @@
+from enum import Enum
+
+class ReportJobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
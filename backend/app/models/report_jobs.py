@@ -0,0 +1,36 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, Text, DateTime, Enum as SQLEnum
+from sqlalchemy.sql import func
+from app.db import Base
+from app.models.report_job_status import ReportJobStatus
+
+class ReportJob(Base):
+    __tablename__ = "report_jobs"
+
+    job_id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(
+        String,
+        ForeignKey("interview_sessions.session_id"),
+        unique=True,  # 1 job per session; retries reuse the row
+        index=True
+    )
+
+    status = Column(
+        SQLEnum(ReportJobStatus, name="report_job_status_enum"),
+        default=ReportJobStatus.QUEUED,
+        nullable=False,
+        index=True,
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+
+    # Not claimable before this time (retry backoff)
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Set when claimed; RUNNING jobs with an old lock are requeued
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
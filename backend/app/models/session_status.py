@@ -3,5 +3,6 @@ from enum import Enum
 class SessionStatus(str, Enum):
     ACTIVE = "ACTIVE"
     PENDING_REPORT = "PENDING_REPORT"
+    GENERATING = "GENERATING"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
@@ -0,0 +1,26 @@
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from app.db import Base
+
+class TurnLatency(Base):
+    """
+    Stage timings (ms since EndOfTurn) of one interview turn.
+    Only written when TRACE_PERSIST is on.
+    """
+    __tablename__ = "turn_latencies"
+
+    latency_id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(
+        String,
+        ForeignKey("interview_sessions.session_id"),
+        index=True,
+        nullable=False
+    )
+
+    turn = Column(Integer, nullable=False)
+    voice_model = Column(String, nullable=True)
+    speculative = Column(Boolean, nullable=False, default=False)
+    stages = Column(JSON, nullable=False)
+    durations = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -37,3 +37,13 @@ Use it only to validate depth through questioning.
 
 {resume_text}
 """
+
+
+def build_greeting(job_role: str) -> str:
+    """
+    Fixed opening line spoken as soon as the interview socket connects.
+    """
+    return (
+        f"Hello! You're applying for {job_role} role. "
+        "Please introduce yourself."
+    )
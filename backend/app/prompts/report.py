@@ -1,6 +1,4 @@
-from app.models.interview_sessions import InterviewSession
-
-def build_report_prompt(session: InterviewSession, transcript_text: str, evaluation_prompt: str) -> str:
+def build_report_prompt(job_role: str, candidate_level: str, transcript_text: str, evaluation_prompt: str) -> str:
     """
     Robust report-generation prompt.
     Designed to NEVER break JSON parsing.
@@ -11,8 +9,8 @@ def build_report_prompt(session: InterviewSession, transcript_text: str, evaluat
     ═══════════════════════════════════════════════════════════
     INTERVIEW CONTEXT
     ═══════════════════════════════════════════════════════════
-    Role: {session.candidate_level} 
-    Level: {session.job_role} position.
+    Role: {candidate_level} 
+    Level: {job_role} position.
 
     ═══════════════════════════════════════════════════════════
     TRANSCRIPT (VERBATIM)
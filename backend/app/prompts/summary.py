@@ -0,0 +1,21 @@
+def build_summary_prompt(previous_summary: str, transcript_text: str) -> str:
+    """
+    Rolling summary of interview turns that have left the LLM context window.
+    """
+    return f"""
+Summarize the interview so far for the interviewer's own notes.
+
+Keep:
+- Topics and questions already covered (so they are not asked again)
+- Key claims, technologies and numbers the candidate gave
+- Weak or unclear answers worth probing later
+- Any strikes for poor engagement
+
+Write at most 120 words of plain sentences. No headings, no lists.
+
+PREVIOUS SUMMARY:
+{previous_summary or "None"}
+
+NEW TRANSCRIPT:
+{transcript_text}
+"""
@@ -1,5 +1,8 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.interview_sessions import InterviewSession
+from app.models.interview_turns import InterviewTurn
 from app.models.session_status import SessionStatus
 
 def load_session(db: Session, session_id: str):
@@ -24,3 +27,45 @@ def persist_session(db: Session, session_id: str, history: list):
     session.status = SessionStatus.PENDING_REPORT
     db.commit()
     return True
+
+# ---- Async versions for code running on the event loop ----
+
+async def load_session_async(db: AsyncSession, session_id: str):
+    result = await db.execute(
+        select(InterviewSession)
+        .where(InterviewSession.session_id == session_id)
+    )
+    return result.scalar_one_or_none()
+
+async def persist_session_async(db: AsyncSession, session_id: str, history: list):
+    session = await load_session_async(db, session_id)
+    if not session:
+        return False
+
+    clean = [m for m in history if m["role"] in ("user", "assistant")]
+    session.transcript = clean
+    session.status = SessionStatus.PENDING_REPORT
+    await db.commit()
+    return True
+
+async def mark_pending_report_async(db: AsyncSession, session_id: str):
+    """End of interview when the turns are already checkpointed."""
+    session = await load_session_async(db, session_id)
+    if not session:
+        return False
+
+    # The turns are the record; drop a full copy an earlier run's failed
+    # finalize may have left, so the report doesn't prefer it
+    session.transcript = None
+    session.status = SessionStatus.PENDING_REPORT
+    await db.commit()
+    return True
+
+async def load_turns_async(db: AsyncSession, session_id: str) -> list:
+    """Checkpointed turns of a session, oldest first, as history-style dicts."""
+    result = await db.execute(
+        select(InterviewTurn.role, InterviewTurn.content)
+        .where(InterviewTurn.session_id == session_id)
+        .order_by(InterviewTurn.seq)
+    )
+    return [{"role": role, "content": content} for role, content in result.all()]
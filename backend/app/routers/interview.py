@@ -1,15 +1,18 @@
+import asyncio
 import uuid
 from typing import List
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.db import get_db                
 from app.models.interview_sessions import InterviewSession 
-from app.services.pdf_service import extract_text_from_pdf
+from app.services.pdf_service import extract_resume_text
 from app.models.users import User
 from app.auth.dependencies import get_current_user_id
 from app.models.interviewer_character import InterviewerCharacter
 from app.models.dto.interviewer import InterviewerPublicDTO
 from app.prompts.interviewer import build_system_prompt
+from app.services.session_warmup import prewarm_session
+from app.config import settings
 
 router = APIRouter()
 
@@ -52,9 +55,14 @@ async def init_interview(
     db: Session = Depends(get_db)
 ):
     # 1. Read and Parse PDF
+    content = await resume.read()
+    if len(content) > settings.RESUME_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Resume PDF is too large")
+
     try:
-        content = await resume.read()
-        resume_text = extract_text_from_pdf(content)
+        resume_text = await extract_resume_text(content)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=422, detail="Resume PDF took too long to parse")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading PDF: {str(e)}")
     
@@ -106,6 +114,9 @@ async def init_interview(
     db.commit()
     db.refresh(new_session)
 
+    # 4. Warm up the realtime session (greeting audio, optional Flux socket)
+    prewarm_session(session_id, job_role, interviewer.voice_model)
+
     return {
         "session_id": session_id,
         "message": "Interview initialized successfully",
@@ -0,0 +1,110 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.loop_lag import loop_lag
+from app.core.metrics import PrometheusText, runtime_stats
+from app.core.tracing import turn_latency
+from app.core.tts_cache import tts_cache
+from app.core.vad import vad_stats
+from app.db import async_engine, engine
+from app.services.report_queue import report_queue
+from app.services.session_registry import live_sessions
+from app.services.session_warmup import warm_session_count
+from app.services.speculation import speculation_stats
+from app.services.voice_service import active_services
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text format, from memory only (the report queue is a cached snapshot)."""
+    out = PrometheusText()
+
+    # ---- interviews ----
+    sessions = live_sessions()
+    attached = sum(1 for live in sessions if live.websocket is not None)
+    out.family("interview_sessions", "gauge", "Running interviews on this worker", [
+        ({"state": "attached"}, attached),
+        ({"state": "detached"}, len(sessions) - attached),
+    ])
+    out.gauge("warm_sessions", "Sessions pre-warmed by /init and not yet claimed", warm_session_count())
+
+    services = active_services()
+    out.gauge("flux_connections", "Open Deepgram Flux listen connections",
+              sum(1 for dg in services if dg.connection is not None))
+    out.gauge("silence_loops", "Silence keepalive loops running",
+              sum(1 for dg in services if dg._silence_task and not dg._silence_task.done()))
+    out.gauge("transcript_queue_depth", "Final transcripts waiting for the conversation loop",
+              sum(dg.transcript_queue.qsize() for dg in services))
+    out.gauge("inbound_audio_queue_depth", "Mic audio chunks waiting to be sent to Flux",
+              sum(dg.inbound_audio.qsize() for dg in services))
+    out.counter("audio_chunks_dropped_total", "Mic audio chunks dropped because Flux fell behind",
+                runtime_stats["audio_chunks_dropped"])
+
+    # ---- providers ----
+    out.gauge("llm_requests_in_flight", "Groq streams currently open", runtime_stats["llm_in_flight"])
+    out.gauge("tts_requests_in_flight", "Aura syntheses currently streaming", runtime_stats["tts_in_flight"])
+    out.counter("llm_requests_total", "Groq chat streams started", runtime_stats["llm_requests"])
+    out.counter("tts_requests_total", "Aura syntheses started (cache misses)", runtime_stats["tts_requests"])
+    out.counter("groq_fallbacks_total", "Replies replaced by the fallback line after a Groq error",
+                runtime_stats["groq_fallbacks"])
+    out.counter("tts_timeouts_total", "TTS requests that hit the timeout", runtime_stats["tts_timeouts"])
+    out.counter("tts_errors_total", "TTS requests that failed", runtime_stats["tts_errors"])
+
+    # ---- caches and gates ----
+    cache = tts_cache.stats()
+    out.gauge("tts_cache_entries", "Phrases in the in-memory TTS cache", cache["entries"])
+    out.gauge("tts_cache_bytes", "Audio bytes held by the in-memory TTS cache", cache["size_bytes"])
+    out.family("tts_cache_lookups_total", "counter", "TTS cache lookups by result", [
+        ({"result": "hit"}, cache["hits"]),
+        ({"result": "disk_hit"}, cache["disk_hits"]),
+        ({"result": "miss"}, cache["misses"]),
+    ])
+    out.family("vad_frames_total", "counter", "Mic frames seen by the energy VAD", [
+        ({"result": "forwarded"}, vad_stats["forwarded"]),
+        ({"result": "suppressed"}, vad_stats["suppressed"]),
+    ])
+    out.family("speculative_turns_total", "counter", "Speculative LLM turns by outcome", [
+        ({"outcome": key}, speculation_stats[key]) for key in ("started", "hits", "misses")
+    ])
+    out.family("speculation_wasted_total", "counter", "Work thrown away by missed speculations", [
+        ({"kind": "tokens"}, speculation_stats["wasted_tokens"]),
+        ({"kind": "tts"}, speculation_stats["wasted_tts"]),
+    ])
+
+    # ---- report queue ----
+    out.gauge("report_workers", "Report workers running", report_queue.running_workers)
+    snapshot, up, age = report_queue.cached_snapshot()
+    out.gauge("report_queue_up", "Whether the report queue could be read on the last refresh", 1 if up else 0)
+    out.gauge("report_queue_snapshot_age_seconds", "Age of the report queue figures below", age)
+    if snapshot is not None:
+        out.family("report_jobs", "gauge", "Report jobs by status", [
+            ({"status": status.value.lower()}, count) for status, (count, _) in snapshot.items()
+        ])
+        out.family("report_job_oldest_age_seconds", "gauge", "Age of the oldest job by status", [
+            ({"status": status.value.lower()}, age) for status, (_, age) in snapshot.items()
+        ])
+
+    # ---- database and loop ----
+    out.family("db_pool_checked_out", "gauge", "DB connections checked out of the pool", [
+        ({"engine": "sync"}, _checked_out(engine)),
+        ({"engine": "async"}, _checked_out(async_engine.sync_engine)),
+    ])
+    out.gauge("event_loop_lag_last_ms", "Most recent event loop lag sample", loop_lag.last_ms)
+    out.gauge("event_loop_lag_max_ms", "Largest event loop lag since start", loop_lag.max_ms)
+    out.histograms("event_loop_lag_ms", "Event loop lag samples (ms)", [(None, loop_lag.histogram)])
+    out.counter("event_loop_stalls_total", "Stalls reported by the loop watchdog (if enabled)",
+                runtime_stats["loop_stalls"])
+
+    # ---- per-turn latency (see app.core.tracing) ----
+    out.histograms("turn_latency_ms", "Interview turn latency by stage (ms since EndOfTurn or per provider)", [
+        ({"stage": stage}, hist) for stage, hist in turn_latency.items()
+    ])
+
+    return PlainTextResponse(out.render(), media_type="text/plain; version=0.0.4")
+
+
+def _checked_out(sync_engine) -> int:
+    checkedout = getattr(sync_engine.pool, "checkedout", None)
+    return checkedout() if checkedout else 0
@@ -1,57 +1,116 @@
 import asyncio
-from app.db import SessionLocal
+from typing import Optional
+from app.db import AsyncSessionLocal
 from fastapi import APIRouter, WebSocket
 from app.services.voice_service import DeepgramService 
-from app.services.report_service import generate_and_send_report
-from app.repository.interview_repository import load_session
+from app.core.audio_codec import resolve_audio_format
+from app.core.log import bind_session
+from app.core.loop_watchdog import child_task_name
+from app.services.report_queue import report_queue
+from app.repository.interview_repository import load_session_async
 from app.services.interview_runtime import audio_loop, conversation_loop, send_greeting
 from app.services.interview_finalize import finalize_interview
+from app.services.session_warmup import claim_warm_session
+from app.services.session_registry import (
+    LiveSession,
+    get_live_session,
+    register_live_session,
+    unregister_live_session,
+)
+from app.services.transcript_store import TranscriptCheckpointer
+from app.prompts.interviewer import build_greeting
 
 router = APIRouter()
 
 @router.websocket("/interview/{session_id}")
-async def websocket_endpoint(websocket: WebSocket,session_id: str) -> None:
+async def websocket_endpoint(
+    websocket: WebSocket,
+    session_id: str,
+    last_seq: Optional[int] = None,
+    audio_format: Optional[str] = None,
+    protocol: str = "json",
+) -> None:
     await websocket.accept()
-    db = SessionLocal()
-    session_data = load_session(db, session_id)
-    db.close()
+    # Tasks spawned for this interview are named after it (see child_task_name)
+    asyncio.current_task().set_name(f"ws:{session_id}")
+    bind_session(session_id)
+
+    # Reconnect to an interview still running on this worker
+    live = get_live_session(session_id)
+    if live:
+        await live.attach(websocket, last_seq)
+        if audio_format:
+            # Format is fixed for the session; tell the client which one it got
+            await live.send_message(_audio_format_message(live.dg))
+        await audio_loop(websocket, live)
+        return
+
+    async with AsyncSessionLocal() as db:
+        session_data = await load_session_async(db, session_id)
     if not session_data:
         await websocket.close(code=1008, reason="Invalid session")
         return
 
-    dg = DeepgramService(voice_model=session_data.voice_model)
-    if not await dg.start():
-        await websocket.close(code=1011, reason="Deepgram connection failed")
-        return
+    # Reuse whatever /init already warmed up; fall back to a cold start
+    warm = claim_warm_session(session_id)
+    dg = await warm.listener() if warm else None
+    if dg is None:
+        dg = DeepgramService(voice_model=session_data.voice_model)
+        if not await dg.start():
+            await websocket.close(code=1011, reason="Deepgram connection failed")
+            return
+    dg.output_format = resolve_audio_format(audio_format)
 
     history = [{"role": "system", "content": session_data.system_prompt}]
-    shutdown_event = asyncio.Event()
 
-    greeting = (
-        f"Hello! You're applying for {session_data.job_role} role. "
-        "Please introduce yourself."
+    checkpointer = TranscriptCheckpointer(session_id, history)
+    checkpointer.start()
+
+    # ?protocol=framed selects binary frames (app.core.framing); older
+    # app versions keep the JSON protocol. Fixed for the whole session.
+    live = LiveSession(
+        session_id, dg, history, checkpointer, framed=(protocol == "framed")
     )
-    await send_greeting(websocket, dg, greeting, history)
+    await live.attach(websocket)
+    register_live_session(live)
+
+    # Clients that don't ask for a format get the legacy 24 kHz linear16
+    # stream and no extra message
+    if audio_format:
+        await live.send_message(_audio_format_message(dg))
+
+    greeting = build_greeting(session_data.job_role)
+    greeting_audio = await warm.greeting_audio(dg.output_format) if warm else None
+    await send_greeting(live, dg, greeting, history, audio=greeting_audio)
 
     audio_task = asyncio.create_task(
-        audio_loop(websocket, dg, shutdown_event)
+        audio_loop(websocket, live), name=child_task_name("audio")
     )
     convo_task = asyncio.create_task(
-        conversation_loop(websocket, dg, history, shutdown_event)
+        conversation_loop(live, dg, history, live.shutdown_event, live.state),
+        name=child_task_name("conversation"),
     )
 
-    await shutdown_event.wait()
+    await live.shutdown_event.wait()
+    unregister_live_session(live)
 
     audio_task.cancel()
     convo_task.cancel()
     await dg.stop()
 
-    finalize_interview(session_id, history)
+    await finalize_interview(session_id, checkpointer)
+
+    report_queue.notify()
 
-    asyncio.create_task(generate_and_send_report(session_id))
+    await live.close()
 
-    try:
-        await websocket.close()
-    except Exception:
-        pass
 
+def _audio_format_message(dg: DeepgramService) -> dict:
+    fmt = dg.output_format
+    return {
+        "type": "control",
+        "action": "AUDIO_FORMAT",
+        "format": fmt.name,
+        "encoding": fmt.encoding,
+        "sample_rate": fmt.sample_rate,
+    }
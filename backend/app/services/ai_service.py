@@ -1,28 +1,67 @@
-from groq import Groq
-from typing import AsyncGenerator
-from app.config import settings 
+import logging
 
-client = Groq(api_key=settings.GROQ_API_KEY)
+from typing import AsyncGenerator, Optional
+
+from app.core import tracing
+from app.core.metrics import runtime_stats
+from app.core.log import sampled
+from app.prompts.summary import build_summary_prompt
+from app.services.providers import get_llm
+
+logger = logging.getLogger(__name__)
 
 async def get_ai_response_stream(history: list) -> AsyncGenerator[str, None]:
     """
-    Streams text chunks from Groq.
+    Streams text chunks from the LLM provider (Groq unless LLM_PROVIDER=fake).
     Yields: "Hello", " ", "there", ...
     """
+    # Generators run on the first __anext__, so this is when the request goes out
+    tracing.mark("llm_request")
+    runtime_stats["llm_requests"] += 1
+    runtime_stats["llm_in_flight"] += 1
+    stream = get_llm().stream(
+        history,
+        model="llama-3.1-8b-instant",
+        temperature=0.5,
+        max_tokens=120,
+    )
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.1-8b-instant", 
-            messages=history,
-            temperature=0.5,
-            max_tokens=120,
-            stream=True 
-        )
+        async for content in stream:
+            if logger.isEnabledFor(logging.DEBUG) and sampled("groq.chunk"):
+                logger.debug('Groq chunk: "%s"', content)
+            yield content
+
+    except Exception as e:
+        logger.error("Groq error: %s", e)
+        runtime_stats["groq_fallbacks"] += 1
+        yield "I am having trouble thinking right now."
+    finally:
+        # Close the provider stream now, not at garbage collection, so its
+        # connection goes back to the pool when the consumer stops early
+        await stream.aclose()
+        runtime_stats["llm_in_flight"] -= 1
 
-        for chunk in completion:
-            if chunk.choices[0].delta.content:
-                print(f'Groq chunk: "{chunk.choices[0].delta.content}"')
-                yield chunk.choices[0].delta.content
 
+async def summarize_turns(previous_summary: str, turns: list) -> Optional[str]:
+    """
+    Fold `turns` into `previous_summary`. Returns None on failure so the
+    caller can keep the turns verbatim and retry later.
+    """
+    transcript_text = "\n".join(
+        f"{'INTERVIEWER' if m['role'] == 'assistant' else m['role'].upper()}: {m['content']}"
+        for m in turns
+    )
+    try:
+        summary = await get_llm().complete(
+            [{
+                "role": "user",
+                "content": build_summary_prompt(previous_summary, transcript_text)
+            }],
+            model="llama-3.1-8b-instant",
+            temperature=0.2,
+            max_tokens=200,
+        )
+        return summary.strip() or None
     except Exception as e:
-        print(f"Groq Error: {e}")
-        yield "I am having trouble thinking right now."
\ No newline at end of file
+        logger.warning("Groq summary error: %s", e)
+        return None
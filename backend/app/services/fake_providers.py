@@ -0,0 +1,310 @@
+import asyncio
+import json
+import re
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from deepgram.core.events import EventType
+
+from app.config import settings
+from app.core.audio_codec import AudioFormat
+from app.core.vad import EnergyVAD
+
+# Offline stand-ins for Groq and Deepgram. Timing comes from config (or
+# the constructors) rather than the network, so runs are reproducible;
+# see benchmarks/runtime_bench.py.
+
+DEFAULT_REPLIES = (
+    "Thanks, that's helpful. Can you walk me through a project where you had to make a difficult technical trade-off?",
+    "Interesting. How did you measure whether that decision was the right one, and what would you change today?",
+    "Good. Let's switch to system design: how would you build a rate limiter for a public API?",
+    "That covers the main points. What would you want to learn in your first three months in this role?",
+)
+
+DEFAULT_UTTERANCES = (
+    "Sure, last year I moved our reporting service from nightly batch jobs to a streaming pipeline",
+    "We tracked the p95 latency of the reports and the on-call load, both went down within a month",
+    "I would use a token bucket per API key stored in Redis and reject requests once the bucket is empty",
+    "Mostly how the team ships to production and where the biggest performance problems are today",
+)
+
+_FAKE_REPORT = json.dumps({
+    "score": 6,
+    "report_markdown": (
+        "## Candidate Summary\nScripted interview used for offline testing.\n\n"
+        "## Technical Evaluation\nNot evaluated.\n\n"
+        "## Strengths\n- Answered every question\n\n"
+        "## Weaknesses\n- None recorded\n\n"
+        "## Hiring Decision\nNo decision.\n\n"
+        "## Final Recommendation\nNone."
+    ),
+})
+
+_FAKE_SUMMARY = "The candidate answered the interviewer's questions so far."
+
+# Roughly how an LLM tokenizer splits English: words with their leading
+# space, punctuation on its own
+_TOKEN = re.compile(r"\s*[\w']+|\s*[^\w\s]+")
+
+
+def _load_script(path: str, default: Sequence[str]) -> tuple:
+    if not path:
+        return tuple(default)
+    with open(path, encoding="utf-8") as f:
+        lines = tuple(line.strip() for line in f if line.strip())
+    return lines or tuple(default)
+
+
+# =========================
+#   LLM
+# =========================
+class FakeLLM:
+    """
+    Scripted replies streamed token by token. The Nth user message in the
+    prompt gets reply N (cycling), so every session follows the same script
+    however the sessions interleave.
+    """
+
+    def __init__(
+        self,
+        replies: Optional[Sequence[str]] = None,
+        first_token_ms: float = settings.FAKE_LLM_FIRST_TOKEN_MS,
+        token_ms: float = settings.FAKE_LLM_TOKEN_MS,
+    ):
+        self.replies = tuple(replies) if replies else _load_script(settings.FAKE_LLM_SCRIPT, DEFAULT_REPLIES)
+        self.first_token_s = first_token_ms / 1000.0
+        self.token_s = token_ms / 1000.0
+
+    async def stream(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        user_turns = sum(1 for m in messages if m["role"] == "user")
+        reply = self.replies[max(user_turns - 1, 0) % len(self.replies)]
+
+        await asyncio.sleep(self.first_token_s)
+        for i, token in enumerate(_TOKEN.findall(reply)):
+            if i:
+                await asyncio.sleep(self.token_s)
+            yield token
+
+    async def complete(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        # The report prompt asks for JSON in its system message; everything
+        # else (context summaries) gets plain text
+        wants_json = any(m["role"] == "system" and "JSON" in m["content"] for m in messages)
+        text = _FAKE_REPORT if wants_json else _FAKE_SUMMARY
+        await asyncio.sleep(self.first_token_s + self.token_s * len(_TOKEN.findall(text)))
+        return text
+
+
+# =========================
+#   STT (FLUX)
+# =========================
+@dataclass
+class FluxEvent:
+    """The fields of a Flux listen.v2 message that DeepgramService reads."""
+    type: str
+    event: Optional[str] = None
+    turn_index: int = 0
+    transcript: str = ""
+    audio_window_start: float = 0.0
+    audio_window_end: float = 0.0
+    end_of_turn_confidence: float = 0.0
+
+
+class FakeFluxConnection:
+    """
+    Turns the PCM it is sent into Flux TurnInfo events, on the clock of the
+    audio itself: StartOfTurn when speech starts, an Update every
+    `update_ms` of speech revealing more of the scripted utterance,
+    EagerEndOfTurn halfway through the end-of-turn silence (only when
+    eager_eot_threshold was requested), TurnResumed if speech comes back,
+    and EndOfTurn after `eot_silence_ms` of silence. Each event reaches the
+    handlers `latency_ms` after the audio that caused it was sent.
+
+    As with real Flux, turns only end if silence keeps arriving; with
+    VAD_ENABLED the hangover must be longer than `eot_silence_ms`.
+    """
+
+    def __init__(
+        self,
+        utterances: Sequence[str],
+        latency_ms: float,
+        eot_silence_ms: float,
+        eager: bool = False,
+        update_ms: float = 240,
+        ms_per_word: float = 300,
+    ):
+        self.utterances = utterances
+        self.latency_s = latency_ms / 1000.0
+        self.eot_silence_ms = eot_silence_ms
+        self.eager = eager
+        self.update_ms = update_ms
+        self.ms_per_word = ms_per_word
+
+        self._handlers: Dict[EventType, List[Callable]] = defaultdict(list)
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+        self._vad = EnergyVAD()
+
+        self._audio_ms = 0.0
+        self._turn = 0
+        self._in_turn = False
+        self._turn_start_ms = 0.0
+        self._speech_ms = 0.0
+        self._updated_at_ms = 0.0
+        self._silence_ms = 0.0
+        self._eager_sent = False
+
+    def on(self, event: EventType, handler: Callable) -> None:
+        self._handlers[event].append(handler)
+
+    async def start_listening(self) -> None:
+        self._dispatch(EventType.OPEN, None)
+        self._dispatch(EventType.MESSAGE, FluxEvent("Connected"))
+        loop = asyncio.get_running_loop()
+        while not self._closed:
+            due, message = await self._events.get()
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if message is None or self._closed:
+                break
+            self._dispatch(EventType.MESSAGE, message)
+        self._dispatch(EventType.CLOSE, None)
+
+    async def send(self, audio: bytes) -> None:
+        samples = np.frombuffer(audio[: len(audio) - len(audio) % 2], dtype=np.int16)
+        duration_ms = samples.size * 1000.0 / 16000
+        self._audio_ms += duration_ms
+
+        due = asyncio.get_running_loop().time() + self.latency_s
+        for message in self._advance(self._vad.is_speech(samples), duration_ms):
+            self._events.put_nowait((due, message))
+
+    def close(self) -> None:
+        self._closed = True
+        self._events.put_nowait((0.0, None))
+
+    def _advance(self, speech: bool, duration_ms: float) -> List[FluxEvent]:
+        events = []
+        if speech:
+            if not self._in_turn:
+                self._in_turn = True
+                self._turn_start_ms = self._audio_ms - duration_ms
+                events.append(self._turn_info("StartOfTurn"))
+            elif self._eager_sent:
+                self._eager_sent = False
+                events.append(self._turn_info("TurnResumed"))
+            self._silence_ms = 0.0
+            self._speech_ms += duration_ms
+            if self._speech_ms - self._updated_at_ms >= self.update_ms:
+                self._updated_at_ms = self._speech_ms
+                events.append(self._turn_info("Update"))
+            return events
+
+        if not self._in_turn:
+            return events
+        self._silence_ms += duration_ms
+        if self._silence_ms >= self.eot_silence_ms:
+            events.append(self._turn_info("EndOfTurn", final=True, confidence=0.9))
+            self._turn += 1
+            self._in_turn = False
+            self._speech_ms = self._updated_at_ms = self._silence_ms = 0.0
+            self._eager_sent = False
+        elif self.eager and not self._eager_sent and self._silence_ms >= self.eot_silence_ms / 2:
+            self._eager_sent = True
+            events.append(self._turn_info("EagerEndOfTurn", final=True, confidence=0.6))
+        return events
+
+    def _turn_info(self, event: str, final: bool = False, confidence: float = 0.0) -> FluxEvent:
+        words = self.utterances[self._turn % len(self.utterances)].split()
+        if not final:
+            words = words[: min(len(words) - 1, int(self._speech_ms / self.ms_per_word))]
+        return FluxEvent(
+            type="TurnInfo",
+            event=event,
+            turn_index=self._turn,
+            transcript=" ".join(words),
+            audio_window_start=self._turn_start_ms / 1000.0,
+            audio_window_end=self._audio_ms / 1000.0,
+            end_of_turn_confidence=confidence,
+        )
+
+    def _dispatch(self, event: EventType, payload) -> None:
+        for handler in self._handlers[event]:
+            handler(payload)
+
+
+class FakeFluxSTT:
+    """Each connection walks the utterance script from the start."""
+
+    def __init__(
+        self,
+        utterances: Optional[Sequence[str]] = None,
+        latency_ms: float = settings.FAKE_STT_LATENCY_MS,
+        eot_silence_ms: float = settings.FAKE_STT_EOT_SILENCE_MS,
+    ):
+        self.utterances = tuple(utterances) if utterances else _load_script(settings.FAKE_STT_SCRIPT, DEFAULT_UTTERANCES)
+        self.latency_ms = latency_ms
+        self.eot_silence_ms = eot_silence_ms
+
+    @asynccontextmanager
+    async def connect(self, **options) -> AsyncIterator[FakeFluxConnection]:
+        connection = FakeFluxConnection(
+            self.utterances,
+            self.latency_ms,
+            self.eot_silence_ms,
+            eager="eager_eot_threshold" in options,
+        )
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+
+# =========================
+#   TTS
+# =========================
+class FakeTTS:
+    """
+    Silence sized like real speech (`chars_per_second` of text per second
+    of audio) in the requested format. The first chunk arrives after
+    `first_audio_ms`, the rest as fast as the consumer takes them.
+    """
+
+    def __init__(
+        self,
+        first_audio_ms: float = settings.FAKE_TTS_FIRST_AUDIO_MS,
+        chars_per_second: float = settings.FAKE_TTS_CHARS_PER_SECOND,
+        chunk_ms: int = 100,
+    ):
+        self.first_audio_s = first_audio_ms / 1000.0
+        self.chars_per_second = chars_per_second
+        self.chunk_ms = chunk_ms
+
+    async def generate(self, text: str, voice_model: str, audio_format: AudioFormat) -> AsyncIterator[bytes]:
+        width = 2 if audio_format.encoding == "linear16" else 1
+        silence = b"\x00" if audio_format.encoding == "linear16" else b"\xff"   # mu-law zero is 0xFF
+
+        size = int(audio_format.bytes_per_second * len(text) / self.chars_per_second)
+        size -= size % width
+        chunk = audio_format.bytes_per_second * self.chunk_ms // 1000
+        chunk -= chunk % width
+
+        await asyncio.sleep(self.first_audio_s)
+        for start in range(0, size, chunk):
+            yield silence * min(chunk, size - start)
+            await asyncio.sleep(0)
@@ -1,16 +1,27 @@
-from app.db import SessionLocal
-from app.repository.interview_repository import persist_session
+import logging
 
-def finalize_interview(session_id: str, history: list):
-    db = SessionLocal()
-    try:
-        success = persist_session(db, session_id, history)
-        if success:
-            print(f"Interview {session_id} finalized.")
-        else:
-            print("Finalize failed: session not found")
-    except Exception as e:
-        db.rollback()
-        print("Finalize interview error:", e)
-    finally:
-        db.close()
+from app.db import AsyncSessionLocal
+from app.repository.interview_repository import mark_pending_report_async, persist_session_async
+from app.services.report_queue import enqueue_report_job
+from app.services.transcript_store import TranscriptCheckpointer
+
+logger = logging.getLogger(__name__)
+
+async def finalize_interview(session_id: str, checkpointer: TranscriptCheckpointer):
+    # Last checkpoint; if it fails, fall back to writing the whole transcript
+    flushed = await checkpointer.close()
+
+    async with AsyncSessionLocal() as db:
+        try:
+            if flushed:
+                success = await mark_pending_report_async(db, session_id)
+            else:
+                success = await persist_session_async(db, session_id, checkpointer.history)
+            if success:
+                await enqueue_report_job(db, session_id)
+                logger.info("Interview %s finalized", session_id)
+            else:
+                logger.warning("Finalize failed: session not found")
+        except Exception as e:
+            await db.rollback()
+            logger.exception("Finalize interview error: %s", e)
@@ -1,46 +1,115 @@
 import asyncio
 import json
+import logging
+from typing import Optional
 from fastapi import WebSocket, WebSocketDisconnect
 from app.services.voice_service import DeepgramService 
-from app.services.ai_service import get_ai_response_stream
+from app.services.ai_service import get_ai_response_stream, summarize_turns
+from app.services.speculation import Speculator
 from app.core.interview_state import InterviewStateManager
+from app.core.context_window import ContextWindow
+from app.core import tracing
+from app.core.loop_watchdog import child_task_name
+from app.config import settings
+from app.services.trace_store import save_turn_trace
+from app.services.session_registry import LiveSession
+from app.core.framing import FrameError, FrameType, iter_frames
+
+logger = logging.getLogger(__name__)
 
 
 async def audio_loop(
     websocket: WebSocket,
-    dg: DeepgramService,
-    shutdown_event: asyncio.Event,
+    live: LiveSession,
 ):
+    """
+    Read one client socket: mic audio goes to Flux, text frames carry
+    control messages and acks. A dropped socket only detaches it from the
+    live session, which then waits for the client to resume.
+    """
+    dg = live.dg
+    shutdown_event = live.shutdown_event
     try:
         while not shutdown_event.is_set():
             msg = await websocket.receive()
 
+            if msg.get("type") == "websocket.disconnect":
+                live.detach(websocket)
+                break
+
             if "text" in msg:
                 try:
                     data = json.loads(msg["text"])
                     if data.get("type") == "control" and data.get("action") == "END_INTERVIEW":
                         shutdown_event.set()
                         break
+                    if data.get("type") == "ack":
+                        live.ack(int(data["seq"]))
                 except Exception:
                     pass
                 continue
 
-            if "bytes" in msg and not dg.assistant_speaking:
-                await dg.send_audio(msg["bytes"])
+            if "bytes" not in msg:
+                continue
+
+            if not live.framed:
+                _feed_mic(dg, msg["bytes"])
+                continue
+
+            try:
+                for frame in iter_frames(msg["bytes"]):
+                    if frame.type == FrameType.AUDIO:
+                        _feed_mic(dg, frame.payload)
+                    elif frame.type == FrameType.ACK:
+                        live.ack(frame.seq)
+                    elif frame.type == FrameType.CONTROL and frame.json().get("action") == "END_INTERVIEW":
+                        shutdown_event.set()
+            except (FrameError, ValueError) as e:
+                logger.warning("Dropped inbound frame: %s", e)
     except WebSocketDisconnect:
-        shutdown_event.set()
+        live.detach(websocket)
     except Exception as e:
-        print("AUDIO LOOP ERROR:", e)
+        logger.exception("Audio loop error: %s", e)
         shutdown_event.set()
 
 
+def _feed_mic(dg: DeepgramService, audio: bytes) -> None:
+    # With barge-in the mic stays open while the assistant talks
+    if dg.barge_in_enabled or not dg.assistant_speaking:
+        dg.feed_audio(audio)
+
+
 async def conversation_loop(
-    websocket: WebSocket,
+    live: LiveSession,
     dg: DeepgramService,
     history: list,
     shutdown_event: asyncio.Event,
+    state: Optional[InterviewStateManager] = None,
+):
+    state = state or InterviewStateManager()
+    context = ContextWindow(history, summarize=summarize_turns)
+    speculator = Speculator(dg, context) if dg.speculative_enabled else None
+
+    try:
+        await _conversation_turns(
+            live, dg, context, state, speculator, shutdown_event
+        )
+    finally:
+        if speculator:
+            speculator.close()
+        context.close()
+
+
+async def _conversation_turns(
+    live: LiveSession,
+    dg: DeepgramService,
+    context: ContextWindow,
+    state: InterviewStateManager,
+    speculator: Optional[Speculator],
+    shutdown_event: asyncio.Event,
 ):
-    state = InterviewStateManager()
+    history = context.history
+    turn = 0
 
     while not state.over and not shutdown_event.is_set():
         try:
@@ -50,122 +119,191 @@ async def conversation_loop(
         except asyncio.TimeoutError:
             if state.expired():
                 await handle_timeout(
-                    websocket, dg, history, state, shutdown_event
+                    live, dg, context, state, shutdown_event
                 )
                 break
             continue
 
         if len(user_text.strip().split()) < 2:
+            if speculator:
+                speculator.drop()
             continue
 
-        await send_transcript(websocket, "user", user_text, history)
+        ai_stream = speculator.take(user_text) if speculator else None
 
-        ai_stream = get_ai_response_stream(history)
-        full_reply = await stream_llm_response(websocket, dg, ai_stream)
+        turn += 1
+        trace = tracing.start_turn(live.session_id, dg.voice_model, turn, dg.turn_ended_at)
+        if trace:
+            trace.speculative = ai_stream is not None
+
+        await send_transcript(live, "user", user_text, history)
+
+        if ai_stream is None:
+            # Marks llm_request itself once the stream is first read
+            ai_stream = get_ai_response_stream(context.messages())
+        else:
+            # The speculative request is already out; adopting it is the request
+            tracing.mark("llm_request")
+        try:
+            full_reply = await stream_llm_response(live, dg, ai_stream)
+        finally:
+            _finish_trace(trace)
 
         if full_reply:
-            await send_transcript(websocket, "assistant", full_reply, history)
+            await send_transcript(live, "assistant", full_reply, history)
 
         if "[END_INTERVIEW]" in full_reply:
-            await end_interview(websocket, state, shutdown_event)
+            await end_interview(live, state, shutdown_event)
             break
 
 
+def _finish_trace(trace: Optional[tracing.TurnTrace]) -> None:
+    if trace is None:
+        return
+    tracing.finish_turn(trace)
+    logger.info("%s", tracing.format_trace(trace))
+    if settings.TRACE_PERSIST:
+        asyncio.create_task(save_turn_trace(trace), name=child_task_name("save-trace"))
+
+
 async def send_transcript(
-    websocket: WebSocket,
+    live: LiveSession,
     role: str,
     content: str,
     history: list,
 ):
-    await websocket.send_text(json.dumps({
+    await live.send_message({
         "type": "transcript",
         "role": role,
         "content": content
-    }))
+    })
     history.append({"role": role, "content": content})
 
 
 async def stream_llm_response(
-    websocket: WebSocket,
+    live: LiveSession,
     dg: DeepgramService,
     ai_stream,
 ) -> str:
-    full_reply = ""
+    """
+    Speak the LLM reply and return the text that was actually spoken.
+    In barge-in mode the reply is cut short as soon as the user talks over
+    it: LLM and TTS work is cancelled, the client is told to drop queued
+    audio, and only the sentences that started playing are returned.
+    """
+    spoken = []
+
+    async def speak():
+        async for audio, clean_text in dg.text_to_speech_stream(ai_stream):
+            if clean_text:
+                spoken.append(clean_text)
+            await live.send_audio(audio, clean_text)
+            if audio:
+                tracing.mark("last_audio", overwrite=True)
 
     dg.assistant_speaking = True
-    dg.start_silence_loop()
+    dg.barge_in.clear()
+    if not dg.barge_in_enabled:
+        # Real mic audio keeps Flux alive in barge-in mode
+        dg.start_silence_loop()
 
+    speak_task = asyncio.create_task(speak(), name=child_task_name("speak"))
+    barge_in_task = None
     try:
-        async for audio, clean_text in dg.text_to_speech_stream(ai_stream):
-            if clean_text:
-                full_reply += clean_text + " "
-            if audio:
-                await websocket.send_bytes(audio)
+        if dg.barge_in_enabled:
+            barge_in_task = asyncio.create_task(dg.barge_in.wait())
+            await asyncio.wait(
+                {speak_task, barge_in_task},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            if not speak_task.done():
+                speak_task.cancel()
+                await asyncio.gather(speak_task, return_exceptions=True)
+                await live.send_message({
+                    "type": "control",
+                    "action": "FLUSH_AUDIO"
+                })
+                return (" ".join(spoken) + "...") if spoken else ""
+
+        await speak_task
     finally:
+        speak_task.cancel()
+        if barge_in_task:
+            barge_in_task.cancel()
         await dg.stop_silence_loop()
         dg.assistant_speaking = False
 
-    return full_reply.strip()
+    return " ".join(spoken).strip()
 
 async def end_interview(
-    websocket: WebSocket,
+    live: LiveSession,
     state: InterviewStateManager,
     shutdown_event: asyncio.Event,
 ):
-    await websocket.send_text(json.dumps({
+    await live.send_message({
         "type": "control",
         "action": "END_INTERVIEW"
-    }))
+    })
     state.over = True
     shutdown_event.set()
 
 
 async def handle_timeout(
-    websocket: WebSocket,
+    live: LiveSession,
     dg: DeepgramService,
-    history: list,
+    context: ContextWindow,
     state: InterviewStateManager,
     shutdown_event: asyncio.Event,
 ):
+    history = context.history
     history.append({
         "role": "system",
         "content": "SYSTEM: Time is up"
     })
 
-    ai_stream = get_ai_response_stream(history)
-    final_reply = await stream_llm_response(websocket, dg, ai_stream)
+    ai_stream = get_ai_response_stream(context.messages())
+    final_reply = await stream_llm_response(live, dg, ai_stream)
 
     if final_reply:
-        await send_transcript(websocket, "assistant", final_reply, history)
+        await send_transcript(live, "assistant", final_reply, history)
 
-    await end_interview(websocket, state, shutdown_event)
+    await end_interview(live, state, shutdown_event)
 
 
 
 async def send_greeting(
-    websocket: WebSocket,
+    live: LiveSession,
     dg: DeepgramService,
     greeting: str,
     history: list,
+    audio: Optional[bytes] = None,
 ):
-    await websocket.send_text(json.dumps({
+    """
+    Speak the greeting. `audio` is the pre-synthesized greeting from /init;
+    when missing, the greeting goes through TTS as usual.
+    """
+    await live.send_message({
         "type": "transcript",
         "role": "assistant",
         "content": greeting
-    }))
+    })
 
     async def single_text_stream():
         yield greeting
 
     dg.assistant_speaking = True
-    dg.start_silence_loop()
+    if not dg.barge_in_enabled:
+        dg.start_silence_loop()
 
     try:
-        async for audio, _ in dg.text_to_speech_stream(single_text_stream()):
-            if audio: 
-                await websocket.send_bytes(audio)
+        if audio:
+            await live.send_audio(audio, greeting)
+        else:
+            async for chunk, sentence in dg.text_to_speech_stream(single_text_stream()):
+                await live.send_audio(chunk, sentence)
     finally:
         await dg.stop_silence_loop()
         dg.assistant_speaking = False
 
-    history.append({"role": "assistant", "content": greeting})
+    history.append({"role": "assistant", "content": greeting})
\ No newline at end of file
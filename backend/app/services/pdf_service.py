@@ -1,13 +1,170 @@
 from pypdf import PdfReader
+import asyncio
+import hashlib
 import io
+import logging
+import multiprocessing
+import multiprocessing.forkserver
+import re
+from collections import Counter, OrderedDict
+from multiprocessing.connection import Connection
+from typing import List, Optional, Tuple
+from app.config import settings
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+logger = logging.getLogger(__name__)
+
+# Lines that carry no information for the interviewer
+_BOILERPLATE = re.compile(
+    r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+|-\s*\d+\s*-|"
+    r"references?\s+(are\s+)?available\s+(up)?on\s+request\.?|"
+    r"curriculum\s+vitae|r[ée]sum[ée])$",
+    re.IGNORECASE,
+)
+_SPACES = re.compile(r"[ \t\u00a0]+")
+
+# sha256(pdf bytes) -> compacted resume text
+_resume_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# One process per parse, so a parse that hits the timeout can be killed;
+# forkserver children start clean, without this process's threads and locks
+_mp = multiprocessing.get_context("forkserver")
+_parse_slots = asyncio.Semaphore(settings.PDF_WORKERS)
+
+
+def start_parse_server() -> None:
+    """
+    Start the forkserver with this module (and pypdf) already imported, so
+    each parse only forks instead of re-importing them. Call at startup.
+    """
+    _mp.set_forkserver_preload([__name__])
+    multiprocessing.forkserver.ensure_running()
+
+
+def extract_pages_from_pdf(file_bytes: bytes, max_pages: int) -> List[str]:
+    """
+    Per-page text of the first `max_pages` pages. Runs in a worker process.
+    """
+    reader = PdfReader(io.BytesIO(file_bytes))
+    return [page.extract_text() or "" for page in reader.pages[:max_pages]]
+
+
+def _parse_worker(conn: Connection, file_bytes: bytes, max_pages: int) -> None:
     try:
-        reader = PdfReader(io.BytesIO(file_bytes))
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
-        return text.strip()
+        conn.send((True, extract_pages_from_pdf(file_bytes, max_pages)))
     except Exception as e:
-        print(f"Error parsing PDF: {e}")
-        return ""
\ No newline at end of file
+        conn.send((False, f"{e.__class__.__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def _wait_for_result(conn: Connection, timeout: float) -> Optional[Tuple[bool, object]]:
+    if not conn.poll(timeout):
+        return None
+    return conn.recv()
+
+
+async def _parse_in_process(file_bytes: bytes, max_pages: int, timeout: float) -> List[str]:
+    """
+    Run extract_pages_from_pdf in a process of its own. Raises
+    asyncio.TimeoutError after `timeout`, once the process is killed.
+    """
+    async with _parse_slots:
+        recv_end, send_end = _mp.Pipe(duplex=False)
+        proc = _mp.Process(
+            target=_parse_worker, args=(send_end, file_bytes, max_pages), daemon=True
+        )
+        proc.start()
+        send_end.close()
+        try:
+            result = await asyncio.to_thread(_wait_for_result, recv_end, timeout)
+        finally:
+            if proc.is_alive():
+                proc.kill()
+            await asyncio.to_thread(proc.join)
+            recv_end.close()
+
+    if result is None:
+        raise asyncio.TimeoutError()
+    ok, value = result
+    if not ok:
+        raise RuntimeError(value)
+    return value
+
+
+def normalize_resume_text(pages: List[str]) -> str:
+    """
+    Collapse whitespace and drop page numbers, boilerplate and
+    headers/footers repeated on most pages.
+    """
+    page_lines = [
+        [_SPACES.sub(" ", line).strip() for line in page.splitlines()]
+        for page in pages
+    ]
+
+    repeated = set()
+    if len(page_lines) > 1:
+        seen_on = Counter(
+            line for lines in page_lines for line in set(lines) if line
+        )
+        repeated = {
+            line for line, count in seen_on.items()
+            if count > 1 and count * 2 >= len(page_lines) and len(line) < 80
+        }
+
+    out = []
+    for lines in page_lines:
+        for line in lines:
+            if not line:
+                if out and out[-1]:
+                    out.append("")
+                continue
+            if line in repeated or _BOILERPLATE.match(line):
+                continue
+            out.append(line)
+
+    return "\n".join(out).strip()
+
+
+def cap_to_token_budget(text: str, max_tokens: int) -> str:
+    """Trim to roughly `max_tokens` (~4 chars per token) at a line boundary."""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars].rstrip()
+
+
+async def extract_resume_text(file_bytes: bytes) -> str:
+    """
+    Parse, compact and cache a resume PDF.
+
+    Parsing runs in a separate process (pypdf is CPU-bound, and a hostile
+    PDF can keep it busy indefinitely), at most PDF_WORKERS at a time. It is
+    bounded by RESUME_MAX_PAGES, and the process is killed after
+    RESUME_PARSE_TIMEOUT. Results are cached by the
+    SHA-256 of the PDF bytes, so re-uploads skip parsing entirely.
+    Raises asyncio.TimeoutError if parsing takes too long.
+    """
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    cached = _resume_cache.get(digest)
+    if cached is not None:
+        _resume_cache.move_to_end(digest)
+        return cached
+
+    try:
+        pages = await _parse_in_process(
+            file_bytes, settings.RESUME_MAX_PAGES, settings.RESUME_PARSE_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        raise
+    except Exception as e:
+        logger.error("Error parsing PDF: %s", e)
+        return ""
+
+    text = cap_to_token_budget(normalize_resume_text(pages), settings.RESUME_MAX_TOKENS)
+
+    if text:
+        _resume_cache[digest] = text
+        while len(_resume_cache) > settings.RESUME_CACHE_SIZE:
+            _resume_cache.popitem(last=False)
+    return text
@@ -0,0 +1,238 @@
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator, Callable, Optional, Protocol
+
+import httpx
+from deepgram import AsyncDeepgramClient
+from deepgram.core.events import EventType
+from groq import NOT_GIVEN, AsyncGroq
+
+from app.config import settings
+from app.core.audio_codec import AudioFormat
+
+# The external services behind an interview, as the rest of the backend
+# sees them. LLM_PROVIDER / STT_PROVIDER / TTS_PROVIDER pick the real
+# clients (default) or the offline fakes in fake_providers.
+
+
+class LLMProvider(Protocol):
+    def stream(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """Reply text as it is generated, in non-empty chunks."""
+        ...
+
+    async def complete(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        ...
+
+
+class STTConnection(Protocol):
+    """An open Flux-style listen connection."""
+
+    def on(self, event: EventType, handler: Callable) -> None:
+        ...
+
+    async def start_listening(self) -> None:
+        """Dispatch events to the handlers until the connection closes."""
+        ...
+
+    async def send(self, audio: bytes) -> None:
+        """16 kHz mono linear16 PCM."""
+        ...
+
+
+class STTProvider(Protocol):
+    def connect(self, **options) -> AsyncContextManager[STTConnection]:
+        ...
+
+
+class TTSProvider(Protocol):
+    def generate(self, text: str, voice_model: str, audio_format: AudioFormat) -> AsyncIterator[bytes]:
+        """Raw audio for `text` in `audio_format`, in chunks as they arrive."""
+        ...
+
+
+# =========================
+#   GROQ
+# =========================
+class GroqLLM:
+    def __init__(self):
+        # One async client per process: every interview shares the same pooled,
+        # keep-alive HTTP connections instead of paying TLS setup per turn.
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.GROQ_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GROQ_MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(settings.GROQ_TIMEOUT),
+        )
+        self.client = AsyncGroq(api_key=settings.GROQ_API_KEY, http_client=self.http_client)
+
+    async def stream(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        completion = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=NOT_GIVEN if max_tokens is None else max_tokens,
+            stream=True,
+        )
+        # Closing the stream releases the pooled connection even when the
+        # consumer stops early.
+        async with completion:
+            async for chunk in completion:
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+
+    async def complete(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        completion = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=NOT_GIVEN if max_tokens is None else max_tokens,
+        )
+        return completion.choices[0].message.content or ""
+
+
+# =========================
+#   DEEPGRAM
+# =========================
+_shared_client: Optional[AsyncDeepgramClient] = None
+
+
+def get_deepgram_client() -> AsyncDeepgramClient:
+    """
+    Process-wide Deepgram client. Aura requests from every session reuse
+    its keep-alive HTTP pool, so TLS setup stays off the per-sentence path.
+    """
+    global _shared_client
+    if _shared_client is None:
+        # Reads DEEPGRAM_API_KEY / DEEPGRAM_ACCESS_TOKEN from env. A custom
+        # httpx client does not get the SDK's timeout, only httpx's 5 s
+        # default, so it is set explicitly on both.
+        _shared_client = AsyncDeepgramClient(
+            timeout=settings.DEEPGRAM_TIMEOUT,
+            httpx_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.DEEPGRAM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.DEEPGRAM_MAX_KEEPALIVE,
+                ),
+                timeout=httpx.Timeout(settings.DEEPGRAM_TIMEOUT),
+            ),
+        )
+    return _shared_client
+
+
+class _FluxConnection:
+    def __init__(self, connection):
+        self._connection = connection
+
+    def on(self, event: EventType, handler: Callable) -> None:
+        self._connection.on(event, handler)
+
+    async def start_listening(self) -> None:
+        await self._connection.start_listening()
+
+    async def send(self, audio: bytes) -> None:
+        # SDK example uses the internal _send for raw binary frames.
+        # If/when SDK exposes send_media for async, you can switch.
+        await self._connection._send(audio)
+
+
+class DeepgramFluxSTT:
+    @asynccontextmanager
+    async def connect(self, **options) -> AsyncIterator[STTConnection]:
+        async with get_deepgram_client().listen.v2.connect(**options) as connection:
+            yield _FluxConnection(connection)
+
+
+class DeepgramAuraTTS:
+    def generate(self, text: str, voice_model: str, audio_format: AudioFormat) -> AsyncIterator[bytes]:
+        return get_deepgram_client().speak.v1.audio.generate(
+            text=text,
+            model=voice_model,
+            encoding=audio_format.encoding,
+            sample_rate=audio_format.sample_rate,
+            container="none",
+        )
+
+
+# =========================
+#   SELECTION
+# =========================
+_llm: Optional[LLMProvider] = None
+_stt: Optional[STTProvider] = None
+_tts: Optional[TTSProvider] = None
+
+
+def _check(kind: str, name: str, real: str) -> bool:
+    """True for the fake provider, False for the real one."""
+    if name not in (real, "fake"):
+        raise ValueError(f"Unknown {kind}_PROVIDER {name!r} (expected {real!r} or 'fake')")
+    return name == "fake"
+
+
+def get_llm() -> LLMProvider:
+    global _llm
+    if _llm is None:
+        if _check("LLM", settings.LLM_PROVIDER, "groq"):
+            from app.services.fake_providers import FakeLLM
+            _llm = FakeLLM()
+        else:
+            _llm = GroqLLM()
+    return _llm
+
+
+def get_stt() -> STTProvider:
+    global _stt
+    if _stt is None:
+        if _check("STT", settings.STT_PROVIDER, "deepgram"):
+            from app.services.fake_providers import FakeFluxSTT
+            _stt = FakeFluxSTT()
+        else:
+            _stt = DeepgramFluxSTT()
+    return _stt
+
+
+def get_tts() -> TTSProvider:
+    global _tts
+    if _tts is None:
+        if _check("TTS", settings.TTS_PROVIDER, "deepgram"):
+            from app.services.fake_providers import FakeTTS
+            _tts = FakeTTS()
+        else:
+            _tts = DeepgramAuraTTS()
+    return _tts
+
+
+def use_providers(
+    llm: Optional[LLMProvider] = None,
+    stt: Optional[STTProvider] = None,
+    tts: Optional[TTSProvider] = None,
+) -> None:
+    """Replace the configured providers (benchmarks, local experiments)."""
+    global _llm, _stt, _tts
+    _llm = llm or _llm
+    _stt = stt or _stt
+    _tts = tts or _tts
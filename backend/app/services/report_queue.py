@@ -0,0 +1,286 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.log import bind_session
+from app.db import AsyncSessionLocal
+from app.models.interview_sessions import InterviewSession
+from app.models.report_job_status import ReportJobStatus
+from app.models.report_jobs import ReportJob
+from app.models.session_status import SessionStatus
+from app.services.report_service import generate_and_send_report
+
+logger = logging.getLogger(__name__)
+
+
+async def enqueue_report_job(db: AsyncSession, session_id: str) -> None:
+    """
+    Queue (or re-queue) the report for `session_id`. Commits.
+    """
+    result = await db.execute(select(ReportJob).where(ReportJob.session_id == session_id))
+    job = result.scalar_one_or_none()
+    if not job:
+        db.add(ReportJob(session_id=session_id))
+    elif job.status != ReportJobStatus.RUNNING:
+        job.status = ReportJobStatus.QUEUED
+        job.attempts = 0
+        job.available_at = datetime.now(timezone.utc)
+        job.last_error = None
+    await db.commit()
+
+
+class ReportWorkerPool:
+    """
+    DB-backed report queue served by a fixed number of asyncio workers.
+
+    Jobs live in `report_jobs` and are claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED, so several API processes can share
+    the queue. The worker count caps how many reports run at once; failed
+    jobs are retried with exponential backoff, and RUNNING jobs whose
+    worker died are requeued once their lock goes stale.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.REPORT_WORKERS,
+        max_attempts: int = settings.REPORT_MAX_ATTEMPTS,
+        retry_base: float = settings.REPORT_RETRY_BASE_SECONDS,
+        poll_interval: float = settings.REPORT_POLL_SECONDS,
+        stale_after: float = settings.REPORT_STALE_SECONDS,
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+        # Last snapshot() result for /metrics, refreshed in the background
+        self._snapshot: Optional[Dict[ReportJobStatus, Tuple[int, float]]] = None
+        self._snapshot_at = 0.0
+        self._snapshot_ok = False
+        self._snapshot_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        try:
+            await self._sweep()
+        except Exception as e:
+            logger.error("Startup sweep failed: %s", e)
+
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.info("Started %d workers", self.workers)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers after a job was enqueued."""
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def snapshot(self) -> Dict[ReportJobStatus, Tuple[int, float]]:
+        """
+        Pending work for /metrics: job count and age in seconds of the
+        oldest job, for QUEUED and RUNNING jobs.
+        """
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(ReportJob.status, func.count(), func.min(ReportJob.created_at))
+                .where(ReportJob.status.in_([ReportJobStatus.QUEUED, ReportJobStatus.RUNNING]))
+                .group_by(ReportJob.status)
+            )).all()
+
+        now = datetime.now(timezone.utc)
+        snapshot = {status: (0, 0.0) for status in (ReportJobStatus.QUEUED, ReportJobStatus.RUNNING)}
+        for status, count, oldest in rows:
+            if oldest is not None and oldest.tzinfo is None:
+                oldest = oldest.replace(tzinfo=timezone.utc)
+            snapshot[status] = (count, (now - oldest).total_seconds() if oldest else 0.0)
+        return snapshot
+
+    def cached_snapshot(self) -> Tuple[Optional[Dict[ReportJobStatus, Tuple[int, float]]], bool, float]:
+        """
+        The last snapshot(), whether the latest refresh succeeded, and the
+        snapshot's age in seconds, without touching the DB. A stale
+        snapshot (older than the poll interval) is refreshed in the
+        background, so a scrape never waits on an exhausted pool.
+        """
+        now = time.monotonic()
+        stale = now - self._snapshot_at >= self.poll_interval
+        if stale and (self._snapshot_task is None or self._snapshot_task.done()):
+            self._snapshot_task = asyncio.create_task(self._refresh_snapshot())
+        age = now - self._snapshot_at if self._snapshot is not None else 0.0
+        return self._snapshot, self._snapshot_ok, age
+
+    async def _refresh_snapshot(self) -> None:
+        try:
+            self._snapshot = await self.snapshot()
+            self._snapshot_ok = True
+        except Exception as e:
+            logger.warning("Report queue snapshot failed: %s", e)
+            self._snapshot_ok = False
+        self._snapshot_at = time.monotonic()
+
+    @property
+    def running_workers(self) -> int:
+        return sum(1 for task in self._tasks if not task.done())
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.error("Worker %d claim error: %s", index, e)
+                job = None
+
+            if job is None:
+                try:
+                    await self._idle()
+                except Exception as e:
+                    # e.g. the DB is down during the stale-job requeue;
+                    # back off and keep the worker alive
+                    logger.error("Worker %d idle error: %s", index, e)
+                    await asyncio.sleep(self.poll_interval)
+                continue
+
+            job_id, session_id, attempt = job
+            bind_session(session_id)
+            error = None
+            try:
+                if not await generate_and_send_report(session_id):
+                    error = "report generation failed"
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+
+            try:
+                await self._finish(job_id, session_id, attempt, error)
+            except Exception as e:
+                logger.error("Could not record result of job %d: %s", job_id, e)
+            bind_session("-")
+
+    async def _idle(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            self._wakeup.clear()
+        except asyncio.TimeoutError:
+            # Quiet period: also a good time to recover abandoned jobs
+            await self._requeue_stale()
+
+    # ---- DB work ----
+
+    async def _claim(self) -> Optional[Tuple[int, str, int]]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(ReportJob)
+                .where(
+                    ReportJob.status == ReportJobStatus.QUEUED,
+                    ReportJob.available_at <= datetime.now(timezone.utc),
+                )
+                .order_by(ReportJob.available_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = result.scalar_one_or_none()
+            if not job:
+                await db.rollback()
+                return None
+
+            job.status = ReportJobStatus.RUNNING
+            job.locked_at = datetime.now(timezone.utc)
+            job.attempts += 1
+            claimed = (job.job_id, job.session_id, job.attempts)
+            await db.commit()
+            return claimed
+
+    async def _finish(self, job_id: int, session_id: str, attempt: int, error: Optional[str]) -> None:
+        async with AsyncSessionLocal() as db:
+            job = await db.get(ReportJob, job_id)
+            if not job:
+                return
+
+            job.locked_at = None
+            job.last_error = error
+            if error is None:
+                job.status = ReportJobStatus.DONE
+            elif attempt >= self.max_attempts:
+                job.status = ReportJobStatus.FAILED
+                await db.execute(
+                    update(InterviewSession)
+                    .where(InterviewSession.session_id == session_id)
+                    .values(status=SessionStatus.FAILED)
+                )
+                logger.error("Giving up on %s after %d attempts: %s", session_id, attempt, error)
+            else:
+                delay = self.retry_base * (2 ** (attempt - 1))
+                job.status = ReportJobStatus.QUEUED
+                job.available_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                logger.warning("Retrying %s in %.0fs: %s", session_id, delay, error)
+            await db.commit()
+
+    async def _requeue_stale(self) -> int:
+        async with AsyncSessionLocal() as db:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.stale_after)
+            result = await db.execute(
+                select(ReportJob)
+                .where(
+                    ReportJob.status == ReportJobStatus.RUNNING,
+                    ReportJob.locked_at < cutoff,
+                )
+                .with_for_update(skip_locked=True)
+            )
+            stale = result.scalars().all()
+            for job in stale:
+                job.status = ReportJobStatus.QUEUED
+                job.locked_at = None
+
+            # Their worker died mid-report: hand the sessions back as well
+            if stale:
+                await db.execute(
+                    update(InterviewSession)
+                    .where(
+                        InterviewSession.session_id.in_([job.session_id for job in stale]),
+                        InterviewSession.status == SessionStatus.GENERATING,
+                    )
+                    .values(status=SessionStatus.PENDING_REPORT)
+                )
+            await db.commit()
+            return len(stale)
+
+    async def _sweep(self) -> None:
+        """
+        Startup recovery: requeue abandoned jobs and create jobs for sessions
+        left in PENDING_REPORT (e.g. finished before a restart).
+        """
+        requeued = await self._requeue_stale()
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(InterviewSession.session_id)
+                .outerjoin(ReportJob, ReportJob.session_id == InterviewSession.session_id)
+                .where(
+                    InterviewSession.status == SessionStatus.PENDING_REPORT,
+                    ReportJob.job_id.is_(None),
+                )
+            )
+            orphans = result.scalars().all()
+            for session_id in orphans:
+                db.add(ReportJob(session_id=session_id))
+            await db.commit()
+            logger.info("Sweep: %d stale jobs requeued, %d sessions enqueued", requeued, len(orphans))
+
+
+report_queue = ReportWorkerPool()
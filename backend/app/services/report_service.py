@@ -1,83 +1,100 @@
 import dirtyjson
+import logging
 import re
-from groq import Groq
+from dataclasses import dataclass
+from typing import Optional
 from app.models.interview_sessions import InterviewSession
-from app.db import SessionLocal
-from app.config import settings 
+from sqlalchemy import select, update
+from app.db import AsyncSessionLocal
+from app.repository.interview_repository import load_turns_async
 from app.prompts.report import build_report_prompt
 from app.models.session_status import SessionStatus
 from app.models.interview_reports import InterviewReport
+from app.services.providers import get_llm
 from app.services.mail_service import MailService
 from app.models.users import User
 from app.models.interviewer_character import InterviewerCharacter
 
-client = Groq(api_key=settings.GROQ_API_KEY)
+logger = logging.getLogger(__name__)
+
 mail_service = MailService()
 
-async def generate_and_send_report(session_id: str):
+
+@dataclass
+class ReportInput:
+    """Everything report generation needs, copied out of the DB at claim time."""
+    job_role: str
+    candidate_level: str
+    transcript: list
+    evaluation_prompt: str
+    user_email: Optional[str]
+
+
+async def generate_and_send_report(session_id: str) -> bool:
     """
     Generates an interview report using LLM and sends it via email.
-    """
-    db = SessionLocal()
-    try:
-        # A. Fetch Session
-        interview_session = db.query(InterviewSession).filter(InterviewSession.session_id == session_id).with_for_update().first()
 
-        interviewer = db.query(InterviewerCharacter).filter(InterviewerCharacter.id == interview_session.interviewer_id).first()
+    Runs as a short claim-then-release state machine so no DB connection
+    or row lock is held while the LLM or SMTP work is in progress:
+      1. PENDING_REPORT -> GENERATING, read inputs, commit
+      2. LLM call and JSON parsing (no DB)
+      3. save report, GENERATING -> COMPLETED, commit
+      4. send email (no DB)
 
-        if not interview_session:
-            print(f"No session found for {session_id}")
-            return
-        if interview_session.status in [SessionStatus.COMPLETED, SessionStatus.FAILED]:
-            print(f"Session {session_id} already {interview_session.status.value}, skipping")
-            return
-        
-        interview_report = db.query(InterviewReport).filter(InterviewReport.session_id == session_id).first()
-
-        if not interview_report:
-            interview_report = InterviewReport(session_id=session_id)
-            db.add(interview_report)
-            db.flush()
+    Returns False when the attempt failed in a way a retry may fix (LLM
+    error, unparseable output, DB error, or a session still GENERATING
+    because an earlier release failed); the session is then put back in
+    PENDING_REPORT for the report queue to retry.
+    """
+    # A. Claim
+    try:
+        report_input = await claim_session_for_report(session_id)
+    except Exception as e:
+        logger.error("Could not claim session %s: %s", session_id, e)
+        return False
+    if not report_input:
+        return True
 
+    try:
         # 1. Sanitize Transcript    
         clean_transcript = []
-        if isinstance(interview_session.transcript, list):
-            for msg in interview_session.transcript:
-                # Ensure content is not None
-                content = msg.get("content", "")
-                role = msg.get("role", "unknown")
-                if content and content.strip() and role in ["user", "assistant"]:
-                    speaker = "INTERVIEWER" if role == "assistant" else "CANDIDATE"
-                    clean_transcript.append(f"{speaker}: {content.strip()}")
+        for msg in report_input.transcript:
+            # Ensure content is not None
+            content = msg.get("content", "")
+            role = msg.get("role", "unknown")
+            if content and content.strip() and role in ["user", "assistant"]:
+                speaker = "INTERVIEWER" if role == "assistant" else "CANDIDATE"
+                clean_transcript.append(f"{speaker}: {content.strip()}")
         
         transcript_text = "\n\n".join(clean_transcript)
 
         # 2. VALIDATION CHECK (Crucial Fix)
         if not transcript_text.strip():
-            print(f"Empty transcript after cleaning for {session_id}")
+            logger.warning("Empty transcript after cleaning for %s", session_id)
             # Set a fallback status so we know it failed
-            interview_session.status = SessionStatus.FAILED
-            db.commit()
-            return
+            await set_session_status(session_id, SessionStatus.FAILED)
+            return True
         
         if len(clean_transcript) < 3:
-            print(f"Very short transcript ({len(clean_transcript)} messages) for {session_id}")
+            logger.warning("Very short transcript (%d messages) for %s", len(clean_transcript), session_id)
 
         # 3. Generate Feedback (The "Brain")
-        print(f"Generating report for {session_id}")
-        print(f"Transcript: {len(transcript_text)} chars, {len(clean_transcript)} messages")
+        logger.info(
+            "Generating report for %s (%d chars, %d messages)",
+            session_id, len(transcript_text), len(clean_transcript),
+        )
         
         report_prompt = build_report_prompt(
-            session=interview_session,
+            job_role=report_input.job_role,
+            candidate_level=report_input.candidate_level,
             transcript_text=transcript_text,
-            evaluation_prompt=interviewer.evaluation_prompt
+            evaluation_prompt=report_input.evaluation_prompt
         )
 
         # 4. Call LLM to generate report
         try: 
-            completion = client.chat.completions.create(
-                model="llama-3.3-70b-versatile", 
-                messages=[{
+            raw_response = await get_llm().complete(
+                [{
                     "role": "system",
                     "content": (
                         "You are a JSON generator. "
@@ -89,66 +106,181 @@ async def generate_and_send_report(session_id: str):
                     "content": report_prompt
                 }
                 ],
+                model="llama-3.3-70b-versatile",
                 temperature=0.2
             )
-            raw_response = completion.choices[0].message.content
         except Exception as e:
-            print(f"Groq API error: {e}")
-            interview_session.status = SessionStatus.FAILED
-            db.commit()
-            return
+            logger.error("Groq API error: %s", e)
+            await release_session(session_id)
+            return False
         
         # 5. Parse JSON response
         parsed_data = parse_llm_json(raw_response)
         
         if not parsed_data:
-            print(f"Failed to parse LLM response for {session_id}")
-            interview_session.status = SessionStatus.FAILED
-            db.commit()
-            return
+            logger.error("Failed to parse LLM response for %s", session_id)
+            await release_session(session_id)
+            return False
         
         # C. Save to DB
+        report = parsed_data.get("report_markdown", "").strip()
+        score = parsed_data.get("score")
         try:
-            report = parsed_data.get("report_markdown", "").strip()
-            score = parsed_data.get("score")
-            interview_report.feedback_report = report
-            interview_report.score = score
-            interview_session.status = SessionStatus.COMPLETED
-            db.commit()
-            print(f"Report saved successfully for {session_id}")
+            await save_report(session_id, report, score)
+            logger.info("Report saved for %s", session_id)
         except Exception as e:
-            print(f"Database error while saving report: {e}")
-            db.rollback()
-            interview_session.status = SessionStatus.FAILED
-            db.commit()
-            raise
+            logger.error("Database error while saving report: %s", e)
+            await release_session(session_id)
+            return False
         
         # D. Send Email
-        user = db.query(User).filter(User.user_id == interview_session.user_id).first()
-        if user and user.email:
+        if report_input.user_email:
             try:
                 await mail_service.send_interview_report(
-                    recipient_email=user.email,
-                    job_role=interview_session.job_role,
-                    report_markdown=interview_report.feedback_report,
-                    score=interview_report.score,
+                    recipient_email=report_input.user_email,
+                    job_role=report_input.job_role,
+                    report_markdown=report,
+                    score=score,
                 )
-                print(f"Email sent to {user.email}")
+                logger.info("Email sent to %s", report_input.user_email)
             except Exception as mail_err:
-                print(f"Mail failed (non-fatal): {mail_err}")
+                logger.warning("Mail failed (non-fatal): %s", mail_err)
+
+        return True
             
     except Exception as e:
-        print(f"Unexpected error generating report for {session_id}: {e}")
-        db.rollback()
+        logger.exception("Unexpected error generating report for %s: %s", session_id, e)
         try:
-            if interview_session:
-                interview_session.status = SessionStatus.FAILED
-                db.commit()
-        except:
+            await release_session(session_id)
+        except Exception:
             pass
+        return False
     finally:
-        db.close()
-        print(f"Report generation completed for {session_id}")
+        logger.info("Report generation completed for %s", session_id)
+
+
+async def claim_session_for_report(session_id: str) -> Optional[ReportInput]:
+    """
+    Atomically move the session PENDING_REPORT -> GENERATING and copy out
+    its inputs. Returns None if there is nothing to do (missing session or
+    already finished).
+
+    A session found in GENERATING was left there by an earlier attempt
+    whose release failed (the report queue runs one job per session at a
+    time), so it is handed back to PENDING_REPORT and the claim raises to
+    get the job retried.
+    """
+    async with AsyncSessionLocal() as db:
+        claimed = await db.execute(
+            update(InterviewSession)
+            .where(
+                InterviewSession.session_id == session_id,
+                InterviewSession.status == SessionStatus.PENDING_REPORT,
+            )
+            .values(status=SessionStatus.GENERATING)
+        )
+        if not claimed.rowcount:
+            await db.rollback()
+            status = await db.scalar(
+                select(InterviewSession.status)
+                .where(InterviewSession.session_id == session_id)
+            )
+            if status is None:
+                logger.warning("No session found for %s", session_id)
+                return None
+            if status == SessionStatus.GENERATING:
+                await db.execute(
+                    update(InterviewSession)
+                    .where(
+                        InterviewSession.session_id == session_id,
+                        InterviewSession.status == SessionStatus.GENERATING,
+                    )
+                    .values(status=SessionStatus.PENDING_REPORT)
+                )
+                await db.commit()
+                raise RuntimeError(f"session {session_id} was left GENERATING, released for retry")
+            logger.info("Session %s is %s, skipping", session_id, status.value)
+            return None
+
+        result = await db.execute(
+            select(
+                InterviewSession.job_role,
+                InterviewSession.candidate_level,
+                InterviewSession.transcript,
+                InterviewerCharacter.evaluation_prompt,
+                User.email,
+            )
+            .outerjoin(InterviewerCharacter, InterviewerCharacter.id == InterviewSession.interviewer_id)
+            .outerjoin(User, User.user_id == InterviewSession.user_id)
+            .where(InterviewSession.session_id == session_id)
+        )
+        row = result.one()
+
+        # The transcript column is only written when the final checkpoint
+        # failed (finalize then saves the whole history there, and the
+        # turns hold just the earlier flushes) or for sessions from before
+        # checkpointing. Otherwise the checkpointed turns are the record.
+        if isinstance(row.transcript, list) and row.transcript:
+            transcript = row.transcript
+        else:
+            transcript = await load_turns_async(db, session_id)
+        await db.commit()
+
+        return ReportInput(
+            job_role=row.job_role,
+            candidate_level=row.candidate_level,
+            transcript=transcript,
+            evaluation_prompt=row.evaluation_prompt or "",
+            user_email=row.email,
+        )
+
+
+async def save_report(session_id: str, report: str, score) -> None:
+    """Write the report and mark the session COMPLETED in one short transaction."""
+    async with AsyncSessionLocal() as db:
+        try:
+            interview_report = await db.scalar(
+                select(InterviewReport).where(InterviewReport.session_id == session_id)
+            )
+            if not interview_report:
+                interview_report = InterviewReport(session_id=session_id)
+                db.add(interview_report)
+
+            interview_report.feedback_report = report
+            interview_report.score = score
+            await db.execute(
+                update(InterviewSession)
+                .where(InterviewSession.session_id == session_id)
+                .values(status=SessionStatus.COMPLETED)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def release_session(session_id: str) -> None:
+    """Hand a claimed session back (GENERATING -> PENDING_REPORT) for a retry."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(InterviewSession)
+            .where(
+                InterviewSession.session_id == session_id,
+                InterviewSession.status == SessionStatus.GENERATING,
+            )
+            .values(status=SessionStatus.PENDING_REPORT)
+        )
+        await db.commit()
+
+
+async def set_session_status(session_id: str, status: SessionStatus) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(InterviewSession)
+            .where(InterviewSession.session_id == session_id)
+            .values(status=status)
+        )
+        await db.commit()
 
 
 def parse_llm_json(raw_content: str):
@@ -172,5 +304,5 @@ def parse_llm_json(raw_content: str):
             return parsed.to_dict()
         return dict(parsed)
     except Exception as e:
-        print(f"parse_llm_json: Final fallback failed: {e}")
-        return None
\ No newline at end of file
+        logger.warning("parse_llm_json: final fallback failed: %s", e)
+        return None
@@ -0,0 +1,282 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from fastapi import WebSocket
+
+from app.config import settings
+from app.core.framing import FrameType, encode_batch, encode_frame, encode_message
+from app.core.interview_state import InterviewStateManager
+from app.services.transcript_store import TranscriptCheckpointer
+from app.services.voice_service import DeepgramService
+
+logger = logging.getLogger(__name__)
+
+Frame = Tuple[int, Union[str, bytes]]
+
+
+class LiveSession:
+    """
+    A running interview, kept separate from the socket that carries it.
+
+    The conversation sends through a LiveSession (send_message /
+    send_audio) instead of the websocket. Every outbound frame gets the next
+    sequence number (1, 2, 3, ... across text and binary frames). If the
+    socket drops, the Flux connection, history and interview clock keep
+    running for a grace window; a client reconnecting with ?last_seq=N gets
+    every frame after N replayed.
+
+    Only clients that opted into resume have their frames buffered until
+    acked: framed clients from the start, JSON clients from their first
+    ack. If frames after N are no longer buffered (never buffered, or
+    dropped to stay under replay_max_bytes), nothing is replayed and the
+    client gets a RESUME_GAP control message instead of audio with a hole
+    in it.
+
+    Frames are JSON text + raw audio by default, or binary frames from
+    app.core.framing when `framed` is set. JSON messages carry their "seq";
+    the audio frames between two messages take the numbers in between. In
+    framed mode, frames that pile up while a send is in flight go out
+    together as one BATCH message.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        dg: DeepgramService,
+        history: list,
+        checkpointer: TranscriptCheckpointer,
+        grace_seconds: float = settings.SESSION_RESUME_GRACE_SECONDS,
+        replay_max_bytes: int = settings.REPLAY_BUFFER_MAX_BYTES,
+        framed: bool = False,
+    ):
+        self.session_id = session_id
+        self.dg = dg
+        self.history = history
+        self.checkpointer = checkpointer
+        self.state = InterviewStateManager()
+        self.shutdown_event = asyncio.Event()
+
+        self.websocket: Optional[WebSocket] = None
+        self.grace_seconds = grace_seconds
+        self.replay_max_bytes = replay_max_bytes
+        self.framed = framed
+
+        self._seq = 0
+        self._sentence_id = 0
+        self._outbox: List[Union[str, bytes]] = []
+        self._unacked: Deque[Frame] = deque()
+        self._unacked_bytes = 0
+        self._buffering = framed
+        # Highest seq that was neither acked nor kept for replay
+        self._lost_through = 0
+        self._send_lock = asyncio.Lock()
+        self._grace_handle: Optional[asyncio.TimerHandle] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+    # ---- outbound interface used by interview_runtime ----
+
+    async def send_message(self, message: dict) -> None:
+        """A transcript or control message ({"type": ..., ...})."""
+        await self._emit([(FrameType.CONTROL, message, 0)])
+
+    async def send_audio(self, audio: Optional[bytes], sentence: str = "") -> None:
+        """
+        Assistant audio. A non-empty `sentence` starts a new sentence; in
+        framed mode its text goes out with the audio, and every AUDIO frame
+        carries the id of the sentence it belongs to.
+        """
+        frames = []
+        if sentence:
+            self._sentence_id = (self._sentence_id + 1) & 0xFFFF
+            if self.framed:
+                frames.append((FrameType.SENTENCE, sentence.encode("utf-8"), self._sentence_id))
+        if audio:
+            frames.append((FrameType.AUDIO, audio, self._sentence_id))
+        if frames:
+            await self._emit(frames)
+
+    # ---- connection management ----
+
+    async def attach(self, websocket: WebSocket, last_seq: Optional[int] = None) -> None:
+        """
+        Route output to `websocket`. With `last_seq`, first replay every
+        buffered frame the client has not seen, or send RESUME_GAP if some
+        of them are gone.
+        """
+        self._cancel_grace()
+
+        async with self._send_lock:
+            old, self.websocket = self.websocket, websocket
+            if old is not None and old is not websocket:
+                asyncio.create_task(_close_quietly(old))
+
+            if last_seq is None:
+                return
+            gap = last_seq < self._lost_through
+            if gap:
+                # Skip what can't be replayed whole; the client resyncs from live
+                self.ack(self._seq)
+                logger.warning(
+                    "Resume from seq %d, frames up to %d were not buffered",
+                    last_seq, self._lost_through,
+                )
+            else:
+                self.ack(last_seq)
+            replay = [payload for _, payload in self._unacked]
+            # Frames already queued behind the lock are covered by the replay
+            self._outbox.clear()
+            try:
+                await self._send_all(websocket, replay)
+            except Exception:
+                self.websocket = None
+                self._start_grace()
+                return
+            if not gap:
+                logger.info("Session resumed, replayed %d frames", len(replay))
+
+        if gap:
+            await self.send_message({"type": "control", "action": "RESUME_GAP"})
+
+    def detach(self, websocket: WebSocket) -> None:
+        """The socket went away: keep the session alive for the grace window."""
+        if websocket is not self.websocket:
+            return  # already replaced by a newer connection
+        self.websocket = None
+        self._start_grace()
+
+    def ack(self, seq: int) -> None:
+        # An ack means the client can resume: buffer from here on
+        self._buffering = True
+        while self._unacked and self._unacked[0][0] <= seq:
+            _, payload = self._unacked.popleft()
+            self._unacked_bytes -= len(payload)
+
+    async def close(self) -> None:
+        self._cancel_grace()
+        if self.websocket is not None:
+            await _close_quietly(self.websocket)
+            self.websocket = None
+
+    # ---- internals ----
+
+    async def _emit(self, frames: List[Tuple[FrameType, Union[dict, bytes], int]]) -> None:
+        for frame_type, body, ref in frames:
+            self._seq += 1
+            payload = self._encode(self._seq, frame_type, body, ref)
+            if self._buffering:
+                self._unacked.append((self._seq, payload))
+                self._unacked_bytes += len(payload)
+            else:
+                self._lost_through = self._seq
+            self._outbox.append(payload)
+        while self._unacked_bytes > self.replay_max_bytes and len(self._unacked) > 1:
+            self._lost_through, dropped = self._unacked.popleft()
+            self._unacked_bytes -= len(dropped)
+
+        async with self._send_lock:
+            # An earlier sender (or a replay) may already have flushed our frames
+            if not self._outbox:
+                return
+            payloads, self._outbox = self._outbox, []
+            websocket = self.websocket
+            if websocket is None:
+                return
+            try:
+                await self._send_all(websocket, payloads)
+            except Exception:
+                self.detach(websocket)
+
+    def _encode(self, seq: int, frame_type: FrameType, body: Union[dict, bytes], ref: int) -> Union[str, bytes]:
+        if self.framed:
+            if isinstance(body, dict):
+                return encode_message(seq, body)
+            return encode_frame(frame_type, seq, body, ref)
+        # JSON protocol: messages as text, audio as bare binary frames
+        if isinstance(body, dict):
+            return json.dumps({**body, "seq": seq})
+        return body
+
+    async def _send_all(self, websocket: WebSocket, payloads: List[Union[str, bytes]]) -> None:
+        if not payloads:
+            return
+        if self.framed:
+            batch = payloads[0] if len(payloads) == 1 else encode_batch(payloads)
+            await websocket.send_bytes(batch)
+            return
+        for payload in payloads:
+            await _send(websocket, payload)
+
+    def _start_grace(self) -> None:
+        if self.shutdown_event.is_set() or self._grace_handle:
+            return
+        if self.grace_seconds <= 0:
+            self.shutdown_event.set()
+            return
+
+        logger.info("Socket lost, waiting %.0fs for resume", self.grace_seconds)
+        self._grace_handle = asyncio.get_running_loop().call_later(
+            self.grace_seconds, self._expire
+        )
+        # No mic audio while detached: keep Flux from timing out
+        self._keepalive_task = asyncio.create_task(
+            self._keepalive(), name=f"ws:{self.session_id}:grace-keepalive"
+        )
+
+    def _cancel_grace(self) -> None:
+        if self._grace_handle:
+            self._grace_handle.cancel()
+            self._grace_handle = None
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+    def _expire(self) -> None:
+        self._grace_handle = None
+        logger.info("Session not resumed in time, ending")
+        self.shutdown_event.set()
+
+    async def _keepalive(self) -> None:
+        while True:
+            await self.dg.send_keepalive()
+            await asyncio.sleep(self.dg._silence_interval)
+
+
+async def _send(websocket: WebSocket, payload: Union[str, bytes]) -> None:
+    if isinstance(payload, bytes):
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload)
+
+
+async def _close_quietly(websocket: WebSocket) -> None:
+    try:
+        await websocket.close()
+    except Exception:
+        pass
+
+
+# session_id -> LiveSession for interviews running in this process
+_live_sessions: Dict[str, LiveSession] = {}
+
+
+def register_live_session(live: LiveSession) -> None:
+    _live_sessions[live.session_id] = live
+
+
+def get_live_session(session_id: str) -> Optional[LiveSession]:
+    live = _live_sessions.get(session_id)
+    if live and live.shutdown_event.is_set():
+        return None
+    return live
+
+
+def live_sessions() -> list:
+    return list(_live_sessions.values())
+
+
+def unregister_live_session(live: LiveSession) -> None:
+    if _live_sessions.get(live.session_id) is live:
+        del _live_sessions[live.session_id]
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from app.config import settings
+from app.core.audio_codec import DEFAULT_AUDIO_FORMAT, AudioFormat, transcode
+from app.core.log import bind_session
+from app.prompts.interviewer import build_greeting
+from app.services.voice_service import DeepgramService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmSession:
+    """
+    Work started at /init so the websocket can speak immediately.
+    """
+    greeting: str
+    dg: DeepgramService
+    greeting_task: asyncio.Task
+    stt_task: Optional[asyncio.Task] = None
+    expiry: Optional[asyncio.TimerHandle] = field(default=None, repr=False)
+
+    async def greeting_audio(self, fmt: AudioFormat = DEFAULT_AUDIO_FORMAT) -> Optional[bytes]:
+        """
+        Pre-synthesized greeting, waiting for it if still in flight. It is
+        synthesized before the client picks a format, so other formats are
+        transcoded from the default one.
+        """
+        if self.greeting_task.cancelled():
+            return None
+        audio = await self.greeting_task
+        if audio and fmt != DEFAULT_AUDIO_FORMAT:
+            audio = transcode(audio, DEFAULT_AUDIO_FORMAT.sample_rate, fmt)
+        return audio
+
+    async def listener(self) -> Optional[DeepgramService]:
+        """The pre-opened Flux connection, or None if it wasn't opened."""
+        if not self.stt_task or self.stt_task.cancelled():
+            return None
+        if not await self.stt_task:
+            return None
+        await self.dg.stop_silence_loop()
+        return self.dg
+
+
+# session_id -> WarmSession (per process, short TTL)
+_warm_sessions: Dict[str, WarmSession] = {}
+
+
+def prewarm_session(session_id: str, job_role: str, voice_model: str) -> None:
+    """
+    Start synthesizing the greeting (and optionally open Flux) in the background.
+    Must be called from a running event loop.
+    """
+    bind_session(session_id)
+    greeting = build_greeting(job_role)
+    dg = DeepgramService(voice_model=voice_model)
+
+    warm = WarmSession(
+        greeting=greeting,
+        dg=dg,
+        greeting_task=asyncio.create_task(
+            dg._tts_with_timeout(greeting, DEFAULT_AUDIO_FORMAT, persist=True),
+            name=f"warmup:{session_id}:greeting",
+        ),
+    )
+    if settings.PREWARM_STT:
+        warm.stt_task = asyncio.create_task(
+            _open_listener(dg), name=f"warmup:{session_id}:flux"
+        )
+
+    warm.expiry = asyncio.get_running_loop().call_later(
+        settings.PREWARM_TTL_SECONDS, _expire, session_id
+    )
+    _warm_sessions[session_id] = warm
+
+
+def claim_warm_session(session_id: str) -> Optional[WarmSession]:
+    """
+    Take ownership of the warm-up for `session_id`. Returns None on a miss
+    (expired, never started, or started on another worker).
+    """
+    warm = _warm_sessions.pop(session_id, None)
+    if warm and warm.expiry:
+        warm.expiry.cancel()
+    return warm
+
+
+def warm_session_count() -> int:
+    return len(_warm_sessions)
+
+
+async def _open_listener(dg: DeepgramService) -> bool:
+    if not await dg.start():
+        return False
+    # Flux drops idle sockets; keep it fed until the client connects
+    dg.start_silence_loop()
+    return True
+
+
+def _expire(session_id: str) -> None:
+    warm = _warm_sessions.pop(session_id, None)
+    if not warm:
+        return
+    warm.greeting_task.cancel()
+    if warm.stt_task:
+        warm.stt_task.cancel()
+        asyncio.create_task(warm.dg.stop())
+    logger.info("Expired unused warm-up for %s", session_id)
@@ -0,0 +1,145 @@
+import asyncio
+import re
+from typing import AsyncGenerator, Optional
+
+from app.core.context_window import ContextWindow
+from app.core.loop_watchdog import child_task_name
+from app.services.ai_service import get_ai_response_stream
+from app.services.voice_service import DeepgramService
+
+# Process-wide counters (hit rate = hits / (hits + misses))
+speculation_stats = {
+    "started": 0,
+    "hits": 0,
+    "misses": 0,
+    "wasted_tokens": 0,
+    "wasted_tts": 0,
+}
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_NON_WORD.sub("", text.lower()).split())
+
+
+class SpeculativeTurn:
+    """
+    An LLM reply started from a provisional (EagerEndOfTurn) transcript.
+    Tokens are buffered; the first sentence is synthesized into the TTS
+    cache so a committed turn starts speaking without a TTS round trip.
+    """
+
+    def __init__(self, dg: DeepgramService, messages: list, provisional: str):
+        self.provisional = provisional
+        self.tokens: list[str] = []
+        self.done = False
+        self.tts_prefetched = False
+        self._dg = dg
+        self._new_token = asyncio.Event()
+        self._prefetch_task: Optional[asyncio.Task] = None
+
+        messages = messages + [{"role": "user", "content": provisional}]
+        self._task = asyncio.create_task(self._run(messages), name=child_task_name("speculation"))
+
+    def matches(self, final_text: str) -> bool:
+        return _normalize(final_text) == _normalize(self.provisional)
+
+    async def _run(self, messages: list) -> None:
+        async def recorded():
+            async for token in get_ai_response_stream(messages):
+                self.tokens.append(token)
+                self._new_token.set()
+                yield token
+
+        try:
+            # Same splitter as the real TTS path, so the prefetched sentence
+            # is byte-for-byte the text it will later look up in the cache.
+            async for sentence in self._dg._sentences(recorded()):
+                if not self._prefetch_task:
+                    self._prefetch_task = asyncio.create_task(
+                        self._dg.prefetch_tts(sentence), name=child_task_name("prefetch")
+                    )
+                    self.tts_prefetched = True
+        finally:
+            self.done = True
+            self._new_token.set()
+
+    async def stream(self) -> AsyncGenerator[str, None]:
+        """Replay buffered tokens, then follow the live stream to its end."""
+        i = 0
+        try:
+            while True:
+                while i < len(self.tokens):
+                    yield self.tokens[i]
+                    i += 1
+                if self.done:
+                    return
+                self._new_token.clear()
+                await self._new_token.wait()
+        finally:
+            # Consumer went away early (e.g. barge-in): stop the LLM call
+            if not self.done:
+                self._task.cancel()
+
+    def discard(self) -> None:
+        self._task.cancel()
+        if self._prefetch_task:
+            self._prefetch_task.cancel()
+        speculation_stats["wasted_tokens"] += len(self.tokens)
+        if self.tts_prefetched:
+            speculation_stats["wasted_tts"] += 1
+
+
+class Speculator:
+    """
+    Hooks a DeepgramService's eager end-of-turn signal to speculative LLM
+    calls. Only one speculation is live at a time.
+    """
+
+    def __init__(self, dg: DeepgramService, context: ContextWindow):
+        self._dg = dg
+        self._context = context
+        self._current: Optional[SpeculativeTurn] = None
+        dg.on_eager_turn = self._on_eager_turn
+
+    def _on_eager_turn(self, provisional: Optional[str]) -> None:
+        if self._current:
+            if provisional and self._current.matches(provisional):
+                return
+            self._current.discard()
+            self._current = None
+
+        # Mirrors conversation_loop: one-word turns never get a reply
+        if provisional and len(provisional.split()) >= 2:
+            self._current = SpeculativeTurn(self._dg, self._context.messages(), provisional)
+            speculation_stats["started"] += 1
+
+    def take(self, final_text: str) -> Optional[AsyncGenerator[str, None]]:
+        """
+        Commit the live speculation if it was built from `final_text`.
+        Returns its token stream, or None if the caller must ask the LLM.
+        """
+        current, self._current = self._current, None
+        if not current:
+            return None
+
+        if current.matches(final_text):
+            speculation_stats["hits"] += 1
+            return current.stream()
+
+        current.discard()
+        speculation_stats["misses"] += 1
+        return None
+
+    def drop(self) -> None:
+        """Discard the live speculation, if any (the turn got no reply)."""
+        if self._current:
+            self._current.discard()
+            self._current = None
+
+    def close(self) -> None:
+        self._dg.on_eager_turn = None
+        if self._current:
+            self._current.discard()
+            self._current = None
@@ -0,0 +1,24 @@
+import logging
+
+from app.core.tracing import TurnTrace
+from app.db import AsyncSessionLocal
+from app.models.turn_latencies import TurnLatency
+
+logger = logging.getLogger(__name__)
+
+
+async def save_turn_trace(trace: TurnTrace) -> None:
+    """Best effort: a failed write only loses the timings."""
+    try:
+        async with AsyncSessionLocal() as db:
+            db.add(TurnLatency(
+                session_id=trace.session_id,
+                turn=trace.turn,
+                voice_model=trace.voice_model,
+                speculative=trace.speculative,
+                stages=dict(trace.marks),
+                durations=trace.durations(),
+            ))
+            await db.commit()
+    except Exception as e:
+        logger.warning("Could not save turn %d of %s: %s", trace.turn, trace.session_id, e)
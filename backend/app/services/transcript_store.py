@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import delete
+
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.models.interview_turns import InterviewTurn
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_ROLES = ("user", "assistant")
+
+
+class TranscriptCheckpointer:
+    """
+    Write-behind checkpointing of a live interview's `history`.
+
+    New user/assistant messages are appended to `interview_turns` every
+    CHECKPOINT_EVERY_TURNS messages or CHECKPOINT_EVERY_SECONDS, from a
+    background task, so the conversation never waits on the DB. Each flush
+    only inserts what was added since the previous one.
+
+    `history` is the whole record of this run. A cold start after the
+    previous run was lost begins a fresh history (with a new greeting), so
+    the first flush replaces any turns an earlier run wrote.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        history: list,
+        every_turns: int = settings.CHECKPOINT_EVERY_TURNS,
+        every_seconds: float = settings.CHECKPOINT_EVERY_SECONDS,
+    ):
+        self.session_id = session_id
+        self.history = history
+        self.every_turns = every_turns
+        self.every_seconds = every_seconds
+
+        self._flushed_upto = 0              # history index already written
+        self._next_seq: Optional[int] = None
+        self._last_flush = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(
+            self._run(), name=f"ws:{self.session_id}:checkpoint"
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(1.0)
+            pending = len(self.history) - self._flushed_upto
+            if not pending:
+                continue
+            if (
+                pending >= self.every_turns
+                or time.monotonic() - self._last_flush >= self.every_seconds
+            ):
+                await self.flush()
+
+    async def flush(self) -> bool:
+        """Write turns added since the last flush. Returns False on DB error."""
+        async with self._lock:
+            end = len(self.history)
+            turns = [
+                m for m in self.history[self._flushed_upto:end]
+                if m.get("role") in TRANSCRIPT_ROLES and m.get("content")
+            ]
+
+            try:
+                if turns:
+                    async with AsyncSessionLocal() as db:
+                        first_seq = self._next_seq
+                        if first_seq is None:
+                            # Same transaction as the insert, so a failed
+                            # flush leaves the old run's turns in place
+                            await db.execute(
+                                delete(InterviewTurn)
+                                .where(InterviewTurn.session_id == self.session_id)
+                            )
+                            first_seq = 0
+
+                        db.add_all([
+                            InterviewTurn(
+                                session_id=self.session_id,
+                                seq=first_seq + i,
+                                role=m["role"],
+                                content=m["content"],
+                            )
+                            for i, m in enumerate(turns)
+                        ])
+                        await db.commit()
+                    self._next_seq = first_seq + len(turns)
+            except Exception as e:
+                # Keep the turns pending; the next flush retries them
+                logger.warning("Checkpoint flush failed for %s: %s", self.session_id, e)
+                return False
+
+            self._flushed_upto = end
+            self._last_flush = time.monotonic()
+            return True
+
+    async def close(self) -> bool:
+        """Stop the background task and write whatever is left."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return await self.flush()
+
@@ -1,28 +1,74 @@
 import asyncio
 import io
-from typing import AsyncGenerator, Optional
+import logging
+import time
+import weakref
+from typing import AsyncGenerator, Callable, Dict, Optional
 
 import numpy as np
-from deepgram import AsyncDeepgramClient
 from deepgram.core.events import EventType
 from deepgram.extensions.types.sockets import ListenV2SocketClientResponse
 
-from app.core.llm_sanitizer import sanitize_llm_output
+from app.config import settings
+from app.core import tracing
+from app.core.metrics import runtime_stats
+from app.core.loop_watchdog import child_task_name
+from app.core.log import sampled
+from app.core.llm_sanitizer import StreamingSanitizer
+from app.core.sentence_segmenter import SentenceSegmenter
+from app.core.tts_cache import tts_cache
+from app.core.vad import EnergyVAD
+from app.core.audio_buffer import DropOldestQueue, FrameCoalescer
+from app.core.audio_codec import DEFAULT_AUDIO_FORMAT, AudioFormat
+from app.services.providers import get_stt, get_tts
+
+logger = logging.getLogger(__name__)
 
 # 100ms of silence @ 16kHz mono int16
 _SILENCE_FRAME = (np.zeros(1600, dtype=np.int16)).tobytes()
 
+# Every DeepgramService alive in this process (live, warming up or closing)
+_services: "weakref.WeakSet[DeepgramService]" = weakref.WeakSet()
+
+
+def active_services() -> list:
+    return list(_services)
+
+
 class DeepgramService:
     def __init__(self, voice_model: str = "aura-2-amalthea-en"):
-        # Reads DEEPGRAM_API_KEY / DEEPGRAM_ACCESS_TOKEN from env
-        self.client = AsyncDeepgramClient()
+        _services.add(self)
+        # Flux and Aura (or their fakes, see providers). The providers are
+        # shared across sessions; only the listen connection is per session.
+        self.stt = get_stt()
+        self.tts = get_tts()
         self._listen_cm = None          # context manager for listen.v2
         self.connection = None          # listen.v2 connection
 
         self.transcript_queue: asyncio.Queue[str] = asyncio.Queue()
+        self.turn_ended_at: Optional[float] = None   # monotonic, last EndOfTurn
         self.assistant_speaking: bool = False
         self.voice_model = voice_model
 
+        # Barge-in: set when the user talks over the assistant
+        self.barge_in_enabled: bool = settings.BARGE_IN_ENABLED
+        self.barge_in_min_words: int = settings.BARGE_IN_MIN_WORDS
+        self.barge_in = asyncio.Event()
+
+        # Speculative turns: called with the provisional transcript on
+        # EagerEndOfTurn and with None on TurnResumed
+        self.speculative_enabled: bool = settings.SPECULATIVE_LLM_ENABLED
+        self.on_eager_turn: Optional[Callable[[Optional[str]], None]] = None
+
+        # Mic audio: receive side coalesces into fixed chunks, a sender task
+        # drains them to Flux (see feed_audio)
+        self._coalescer = FrameCoalescer(16000 * 2 * settings.AUDIO_CHUNK_MS // 1000)
+        self.inbound_audio = DropOldestQueue(settings.AUDIO_QUEUE_MAX_CHUNKS)
+        self._sender_task: Optional[asyncio.Task] = None
+
+        # Optional server-side VAD on mic audio
+        self.vad: Optional[EnergyVAD] = EnergyVAD() if settings.VAD_ENABLED else None
+
         # Silence keepalive
         self._silence_task: Optional[asyncio.Task] = None
         self._silence_interval: float = 0.7  # seconds between silence frames
@@ -30,6 +76,16 @@ class DeepgramService:
         # TTS timeout
         self.tts_timeout: float = 12.0
 
+        # Syntheses in flight, by TTS cache key (see _tts_chunks)
+        self._tts_inflight: Dict[str, asyncio.Future] = {}
+
+        # Outbound audio format, negotiated per client (see audio_codec)
+        self.output_format: AudioFormat = DEFAULT_AUDIO_FORMAT
+
+        # TTS pipelining (see text_to_speech_stream)
+        self.tts_pipelined: bool = settings.TTS_PIPELINED
+        self.tts_lookahead: int = max(0, settings.TTS_LOOKAHEAD)
+
     # =========================
     #   FLUX STT START/STOP
     # =========================
@@ -40,28 +96,39 @@ class DeepgramService:
         try:
             # Required Flux settings: model, audio format, sample rate
             # This assumes you send raw 16kHz mono linear16 PCM from the client.
-            self._listen_cm = self.client.listen.v2.connect(
+            options = {}
+            if self.speculative_enabled:
+                # Flux only emits EagerEndOfTurn/TurnResumed when this is set
+                options["eager_eot_threshold"] = str(settings.EAGER_EOT_THRESHOLD)
+
+            self._listen_cm = self.stt.connect(
                 model="flux-general-en",
                 encoding="linear16",   
-                sample_rate="16000"  
+                sample_rate="16000",
+                **options
             )
 
             # Manually enter the async context manager
             self.connection = await self._listen_cm.__aenter__()
 
             # Register handlers
-            self.connection.on(EventType.OPEN, lambda _: print("[Flux] connection opened"))
-            self.connection.on(EventType.ERROR, lambda e: print("[Flux] ERROR:", e))
-            self.connection.on(EventType.CLOSE, lambda _: print("[Flux] connection closed"))
+            self.connection.on(EventType.OPEN, lambda _: logger.debug("Flux connection opened"))
+            self.connection.on(EventType.ERROR, lambda e: logger.error("Flux error: %s", e))
+            self.connection.on(EventType.CLOSE, lambda _: logger.info("Flux connection closed"))
             self.connection.on(EventType.MESSAGE, self._on_message)
 
-            asyncio.create_task(self.connection.start_listening())
+            asyncio.create_task(
+                self.connection.start_listening(), name=child_task_name("flux-listen")
+            )
+            self._sender_task = asyncio.create_task(
+                self._audio_sender(), name=child_task_name("flux-send")
+            )
 
-            print("Flux connection started successfully")
+            logger.info("Flux connection started")
             return True
 
         except Exception as e:
-            print("Deepgram Start Error:", e)
+            logger.error("Deepgram start error: %s", e)
             return False
 
     async def stop(self):
@@ -69,6 +136,11 @@ class DeepgramService:
         Cleanly close listen connection and silence loop.
         """
         await self.stop_silence_loop()
+        if self._sender_task:
+            self._sender_task.cancel()
+            self._sender_task = None
+        # Nothing will send it now; don't let it leak into a later start()
+        self._coalescer.flush()
 
         try:
             if self._listen_cm:
@@ -76,7 +148,7 @@ class DeepgramService:
                 await self._listen_cm.__aexit__(None, None, None)
 
         except Exception as e:
-            print("Deepgram stop error:", e)
+            logger.warning("Deepgram stop error: %s", e)
         finally:
             self.connection = None
             self._listen_cm = None
@@ -96,18 +168,45 @@ class DeepgramService:
         event = getattr(message, "event", None)
         transcript = getattr(message, "transcript", None)
 
-        # Debug while integrating:
-        # print("[Flux raw]", msg_type, event, transcript)
-
-        # Streamed partials (optional log)
-        if transcript and not self.assistant_speaking:
-            print("User (stream):", transcript)
+        # Streamed partials: one per Flux update, so sampled
+        if (
+            transcript
+            and not self.assistant_speaking
+            and logger.isEnabledFor(logging.DEBUG)
+            and sampled("flux.partial")
+        ):
+            logger.debug("User (stream): %s", transcript)
+
+        # Real speech over the assistant interrupts it (barge-in mode only).
+        # A word threshold keeps coughs and speaker echo from cutting it off.
+        if (
+            self.barge_in_enabled
+            and self.assistant_speaking
+            and not self.barge_in.is_set()
+            and transcript
+            and len(transcript.split()) >= self.barge_in_min_words
+        ):
+            logger.info("Barge-in: %s", transcript)
+            self.barge_in.set()
+
+        # Provisional end of turn: let the speculator start (or drop) an answer.
+        # Handled synchronously so it always lands before the matching EndOfTurn.
+        if (
+            msg_type == "TurnInfo"
+            and self.on_eager_turn
+            and not self.assistant_speaking
+        ):
+            if event == "EagerEndOfTurn" and transcript and transcript.strip():
+                self.on_eager_turn(transcript.strip())
+            elif event == "TurnResumed":
+                self.on_eager_turn(None)
 
         # End-of-turn final transcript
         if msg_type == "TurnInfo" and event == "EndOfTurn":
             final_text = (transcript or "").strip()
-            if final_text and not self.assistant_speaking:
-                print("[Flux EndOfTurn]", final_text)
+            if final_text and (self.barge_in_enabled or not self.assistant_speaking):
+                logger.info("EndOfTurn: %s", final_text)
+                self.turn_ended_at = time.monotonic()
                 self.transcript_queue.put_nowait(final_text)
 
     # =========================
@@ -120,35 +219,68 @@ class DeepgramService:
         """
         if not self.connection:
             return
+        frames = self.vad.process(audio_data) if self.vad else [audio_data]
         try:
-            # SDK example uses the internal _send for raw binary frames
-            await self.connection._send(audio_data)
-            # If/when SDK exposes send_media for async, you can switch:
-            # await self.connection.send_media(audio_data)
+            for frame in frames:
+                await self.connection.send(frame)
         except Exception as e:
-            print("[Flux] send_audio error:", e)
+            if sampled("flux.send_error"):
+                logger.warning("Flux send_audio error: %s", e)
+
+    def feed_audio(self, audio_data: bytes) -> None:
+        """
+        Non-blocking entry point for client mic frames. Frames are packed
+        into AUDIO_CHUNK_MS chunks and queued for the sender task; if Flux
+        falls behind, the oldest chunks are dropped so memory stays bounded.
+        """
+        for chunk in self._coalescer.push(audio_data):
+            if self.inbound_audio.put_nowait(chunk):
+                runtime_stats["audio_chunks_dropped"] += 1
+
+    def flush_audio(self) -> None:
+        """
+        Queue the partial chunk left in the coalescer, so the tail of the
+        candidate's speech isn't held back until (and prepended to) the
+        next unrelated mic audio.
+        """
+        chunk = self._coalescer.flush()
+        if chunk and self.inbound_audio.put_nowait(chunk):
+            runtime_stats["audio_chunks_dropped"] += 1
+
+    async def _audio_sender(self):
+        while True:
+            chunk = await self.inbound_audio.get()
+            await self.send_audio(chunk)
 
     # =========================
     #   SILENCE KEEPALIVE
     # =========================
+    async def send_keepalive(self):
+        """Send one silence frame so Flux doesn't close an idle stream."""
+        if self.connection:
+            try:
+                await self.connection.send(_SILENCE_FRAME)
+            except Exception:
+                # Connection might be closing; ignore
+                pass
+
     async def _silence_loop(self):
         """Continuously send small silence frames until cancelled."""
         try:
             while True:
-                if self.connection:
-                    try:
-                        await self.connection._send(_SILENCE_FRAME)
-                    except Exception:
-                        # Connection might be closing; ignore
-                        pass
+                await self.send_keepalive()
                 await asyncio.sleep(self._silence_interval)
         except asyncio.CancelledError:
             return
 
     def start_silence_loop(self):
         """Start background task that keeps Flux alive while assistant is speaking."""
+        # The mic is muted from here on
+        self.flush_audio()
         if not self._silence_task or self._silence_task.done():
-            self._silence_task = asyncio.create_task(self._silence_loop())
+            self._silence_task = asyncio.create_task(
+                self._silence_loop(), name=child_task_name("silence")
+            )
 
     async def stop_silence_loop(self):
         """Stop the silence background task."""
@@ -166,67 +298,224 @@ class DeepgramService:
     async def text_to_speech_stream(
         self,
         text_stream: AsyncGenerator[str, None]
-    ) -> AsyncGenerator[tuple[bytes, str], None]:
+    ) -> AsyncGenerator[tuple[Optional[bytes], str], None]:
         """
-        Takes a text-token async generator and yields (audio_chunk_bytes, text_so_far).
-        You already use this in your convo loop.
+        Takes a text-token async generator and yields (audio_chunk_bytes, sentence).
+        The sentence text rides on the first chunk of its audio only; later
+        chunks of the same sentence carry "".
         """
-        current_sentence = ""
-        sentence_buffer = []
+        if not self.tts_pipelined:
+            async for sentence in self._sentences(text_stream):
+                audio = await self._tts_with_timeout(sentence)
+                yield audio, sentence
+            return
+
+        # Pipelined mode: sentence N streams to the caller chunk by chunk while
+        # sentence N+1 (up to tts_lookahead ahead) is already being synthesized.
+        # Chunks are still yielded strictly in sentence order.
+        ready: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.tts_lookahead + 1)
+        synth_tasks: list[asyncio.Task] = []
+
+        async def produce():
+            try:
+                async for sentence in self._sentences(text_stream):
+                    await slots.acquire()
+                    chunks: asyncio.Queue = asyncio.Queue()
+                    synth_tasks.append(
+                        asyncio.create_task(
+                            self._tts_into_queue(sentence, chunks), name=child_task_name("tts")
+                        )
+                    )
+                    ready.put_nowait((sentence, chunks))
+            finally:
+                ready.put_nowait(None)
+
+        producer = asyncio.create_task(produce(), name=child_task_name("tts-producer"))
+        try:
+            while True:
+                item = await ready.get()
+                if item is None:
+                    break
+                sentence, chunks = item
+                sent_any = False
+                while True:
+                    chunk = await chunks.get()
+                    if chunk is None:
+                        break
+                    yield chunk, "" if sent_any else sentence
+                    sent_any = True
+                if not sent_any:
+                    # TTS failed or timed out: keep the text, like the sequential path
+                    yield None, sentence
+                slots.release()
+            # Surface errors from the token stream
+            await producer
+        finally:
+            producer.cancel()
+            for task in synth_tasks:
+                task.cancel()
+
+    async def _sentences(
+        self,
+        text_stream: AsyncGenerator[str, None]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Split a token stream into sanitized, non-empty TTS chunks. Tokens
+        are sanitized as they arrive, so a stage direction spanning several
+        tokens (or sentences) is removed whole before segmentation.
+        """
+        sanitizer = StreamingSanitizer()
+        segmenter = SentenceSegmenter()
 
         async for token in text_stream:
-            current_sentence += token
-            if any(p in token for p in [".", "?", "!", "\n"]):
-                sentence_buffer.append(current_sentence)
-                current_sentence = ""
-                
-                if sentence_buffer:
-                    raw_sentence = sentence_buffer.pop(0)
-                    clean_sentence = sanitize_llm_output(raw_sentence)
-                    
-                    if clean_sentence.strip():
-                        audio = await self._tts_with_timeout(clean_sentence)
-                        yield audio, clean_sentence
-
-        if current_sentence.strip():
-            clean_sentence = sanitize_llm_output(current_sentence)
-            audio = await self._tts_with_timeout(clean_sentence)
-            yield audio, clean_sentence
-
-    async def _tts_with_timeout(self, text: str) -> Optional[bytes]:
+            tracing.mark("first_token")
+            for sentence in segmenter.push(sanitizer.feed(token)):
+                tracing.mark("first_sentence")
+                yield sentence
+
+        # Short replies only complete here, at the end of the stream
+        for sentence in segmenter.push(sanitizer.flush()):
+            tracing.mark("first_sentence")
+            yield sentence
+        rest = segmenter.flush()
+        if rest:
+            tracing.mark("first_sentence")
+            yield rest
+
+    async def prefetch_tts(self, text: str) -> None:
+        """
+        Synthesize `text` into the TTS cache without sending it anywhere.
+        A turn that needs the same text meanwhile waits for this instead of
+        sending a second request (see _tts_chunks).
+        """
+        await self._tts_with_timeout(text)
+
+    async def _tts_into_queue(self, text: str, chunks: asyncio.Queue) -> None:
+        """
+        Stream Aura audio for one sentence into `chunks`, ending with None.
+        Same timeout and error semantics as _tts_with_timeout.
+
+        Aura's HTTP chunks come in whatever sizes the network reads return,
+        odd byte counts included. They are re-cut into TTS_FRAME_MS frames
+        of whole samples, so every frame the client gets is playable on its
+        own; the rest of the last frame goes out when the sentence ends.
+        """
+        fmt = self.output_format
+        frames = FrameCoalescer(fmt.frame_bytes(settings.TTS_FRAME_MS))
+
+        async def pump():
+            async for chunk in self._tts_chunks(text):
+                for frame in frames.push(chunk):
+                    chunks.put_nowait(frame)
+
+        try:
+            await asyncio.wait_for(pump(), timeout=self.tts_timeout)
+            tail = frames.flush()
+            if tail:
+                # A trailing odd byte would shift every later sample
+                tail = tail[: len(tail) - len(tail) % fmt.sample_width]
+            if tail:
+                chunks.put_nowait(tail)
+        except asyncio.TimeoutError:
+            logger.warning("TTS timeout after %ss for: '%s...'", self.tts_timeout, text[:50])
+            runtime_stats["tts_timeouts"] += 1
+        except Exception as e:
+            logger.error("TTS error: %s", e)
+            runtime_stats["tts_errors"] += 1
+        finally:
+            chunks.put_nowait(None)
+
+    async def _tts_with_timeout(
+        self,
+        text: str,
+        audio_format: Optional[AudioFormat] = None,
+        persist: bool = False,
+    ) -> Optional[bytes]:
         """
         Wrap TTS call with timeout. Returns None if it fails or times out.
         """
         try:
             return await asyncio.wait_for(
-                self._tts(text),
+                self._tts(text, audio_format, persist),
                 timeout=self.tts_timeout
             )
         except asyncio.TimeoutError:
-            print(f"[TTS] Timeout after {self.tts_timeout}s for: '{text[:50]}...'")
+            logger.warning("TTS timeout after %ss for: '%s...'", self.tts_timeout, text[:50])
+            runtime_stats["tts_timeouts"] += 1
             return None
         except Exception as e:
-            print(f"[TTS] Error: {e}")
+            logger.error("TTS error: %s", e)
+            runtime_stats["tts_errors"] += 1
             return None
 
 
-    async def _tts(self, text: str) -> Optional[bytes]:
+    async def _tts(
+        self,
+        text: str,
+        audio_format: Optional[AudioFormat] = None,
+        persist: bool = False,
+    ) -> Optional[bytes]:
         """
         Deepgram v5 TTS via Aura-2 (streaming → collected into a single bytes blob).
         """
         try:
             audio_bytes = io.BytesIO()
 
-            async for chunk in self.client.speak.v1.audio.generate(
-                text=text,
-                model=self.voice_model, 
-                encoding="linear16",
-                container="none"
-            ):
+            async for chunk in self._tts_chunks(text, audio_format, persist):
                 audio_bytes.write(chunk)
 
             return audio_bytes.getvalue()
 
         except Exception as e:
-            print("TTS Error:", e)
+            logger.error("TTS error: %s", e)
             return None
+
+    async def _tts_chunks(
+        self,
+        text: str,
+        audio_format: Optional[AudioFormat] = None,
+        persist: bool = False,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Raw Aura-2 audio chunks for `text` in `audio_format` (default: the
+        session's output_format), as Deepgram produces them.
+        Cached phrases come back as a single chunk without a network call;
+        `persist` also keeps the result in the cache's disk tier.
+        """
+        fmt = audio_format or self.output_format
+        tracing.mark("tts_request")
+        cache_key = tts_cache.key(self.voice_model, text, fmt.name)
+        cached = await tts_cache.get(cache_key)
+        inflight = self._tts_inflight.get(cache_key)
+        if cached is None and inflight is not None:
+            # Same text already being synthesized (a speculative prefetch):
+            # wait for it rather than paying for a second request
+            await asyncio.wait({inflight})
+            cached = inflight.result()
+        if cached is not None:
+            tracing.mark("first_audio")
+            yield cached
+            return
+
+        chunks = []
+        done = asyncio.get_running_loop().create_future()
+        self._tts_inflight[cache_key] = done
+        runtime_stats["tts_requests"] += 1
+        runtime_stats["tts_in_flight"] += 1
+        try:
+            async for chunk in self.tts.generate(text, self.voice_model, fmt):
+                if not chunks:
+                    tracing.mark("first_audio")
+                chunks.append(chunk)
+                yield chunk
+            # Only complete syntheses are cached (timeouts cancel before this)
+            audio = b"".join(chunks)
+            await tts_cache.put(cache_key, audio, persist)
+            done.set_result(audio)
+        finally:
+            runtime_stats["tts_in_flight"] -= 1
+            if not done.done():
+                done.set_result(None)   # failed: waiters synthesize it themselves
+            if self._tts_inflight.get(cache_key) is done:
+                del self._tts_inflight[cache_key]
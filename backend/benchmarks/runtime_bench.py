@@ -0,0 +1,161 @@
+"""
+Turn latency of the realtime pipeline, offline.
+
+Runs concurrent interviews through interview_runtime.conversation_loop
+with the fake LLM, STT and TTS providers. Each simulated candidate
+streams mic PCM in real time (a tone while talking, silence otherwise),
+waits until the reply has been spoken, and talks again. Stage latencies
+are the ones app.core.tracing records in production, measured from
+EndOfTurn.
+
+Run from backend/:  PYTHONPATH=. python benchmarks/runtime_bench.py --sessions 20
+
+Provider timing comes from the FAKE_* settings, e.g.
+FAKE_LLM_FIRST_TOKEN_MS=500 FAKE_TTS_FIRST_AUDIO_MS=250. DATABASE_URL has
+to be set as for the app, but nothing is written to it.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+# Must be set before app.config is imported
+for _name in ("LLM_PROVIDER", "STT_PROVIDER", "TTS_PROVIDER"):
+    os.environ[_name] = "fake"
+os.environ["TRACE_PERSIST"] = "false"
+# Every session speaks the same script; without this, all but the first
+# would be served from the TTS cache. Set it to measure the cached path.
+os.environ.setdefault("TTS_CACHE_MAX_BYTES", "0")
+os.environ.setdefault("TTS_CACHE_DIR", "")
+
+import numpy as np
+
+from app.core import tracing
+from app.core.loop_lag import loop_lag
+from app.core.metrics import runtime_stats
+from app.services.interview_runtime import conversation_loop
+from app.services.session_registry import LiveSession
+from app.services.transcript_store import TranscriptCheckpointer
+from app.services.voice_service import DeepgramService
+
+FRAME_MS = 20
+SAMPLE_RATE = 16000
+
+_t = np.arange(SAMPLE_RATE * FRAME_MS // 1000) / SAMPLE_RATE
+SPEECH_FRAME = (np.sin(2 * np.pi * 220 * _t) * 4000).astype(np.int16).tobytes()
+SILENCE_FRAME = bytes(len(SPEECH_FRAME))
+
+REPLY_TIMEOUT = 30.0
+
+
+class BenchSocket:
+    """Stands in for the client websocket: counts audio, watches for replies."""
+
+    def __init__(self):
+        self.audio_bytes = 0
+        self.replied = asyncio.Event()
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.audio_bytes += len(data)
+
+    async def send_text(self, data: str) -> None:
+        message = json.loads(data)
+        if message.get("type") == "transcript" and message.get("role") == "assistant":
+            self.replied.set()
+
+    async def close(self) -> None:
+        pass
+
+
+async def speak_turn(live: LiveSession, socket: BenchSocket, speech_ms: int, pause_ms: int) -> None:
+    """Talk for `speech_ms`, stay silent until the reply is over, then pause."""
+    dg = live.dg
+    socket.replied.clear()
+    started = time.monotonic()
+    frames = 0
+
+    async def send(frame: bytes) -> None:
+        nonlocal frames
+        # Mic is muted while the assistant talks, as in audio_loop
+        if not dg.assistant_speaking:
+            dg.feed_audio(frame)
+        frames += 1
+        # Paced against the start of the turn, so sleep overshoot doesn't add up
+        await asyncio.sleep(max(0.0, started + frames * FRAME_MS / 1000 - time.monotonic()))
+
+    for _ in range(speech_ms // FRAME_MS):
+        await send(SPEECH_FRAME)
+    while not socket.replied.is_set() and not live.shutdown_event.is_set():
+        if time.monotonic() - started > REPLY_TIMEOUT:
+            raise TimeoutError(f"{live.session_id}: no reply after {REPLY_TIMEOUT:.0f}s")
+        await send(SILENCE_FRAME)
+    for _ in range(pause_ms // FRAME_MS):
+        await send(SILENCE_FRAME)
+
+
+async def run_session(index: int, args: argparse.Namespace) -> int:
+    session_id = f"bench-{index}"
+    history = [{"role": "system", "content": "You are interviewing a candidate for a backend engineer role."}]
+    dg = DeepgramService()
+    live = LiveSession(session_id, dg, history, TranscriptCheckpointer(session_id, history))
+    socket = BenchSocket()
+    await live.attach(socket)
+    if not await dg.start():
+        raise RuntimeError("STT provider failed to start")
+
+    conversation = asyncio.create_task(
+        conversation_loop(live, dg, history, live.shutdown_event, live.state),
+        name=f"ws:{session_id}",
+    )
+    try:
+        for _ in range(args.turns):
+            if live.shutdown_event.is_set():
+                break
+            await speak_turn(live, socket, args.speech_ms, args.pause_ms)
+    finally:
+        live.shutdown_event.set()
+        await conversation
+        await dg.stop()
+    return socket.audio_bytes
+
+
+def _ms(value) -> str:
+    return "-" if value is None else f"{value:.0f}"
+
+
+async def run(args: argparse.Namespace) -> None:
+    loop_lag.start()
+    started = time.monotonic()
+    audio = await asyncio.gather(*(run_session(i, args) for i in range(args.sessions)))
+    elapsed = time.monotonic() - started
+    await loop_lag.stop()
+
+    print(
+        f"{args.sessions} sessions x {args.turns} turns in {elapsed:.1f}s, "
+        f"{sum(audio) / 1e6:.1f} MB of audio sent"
+    )
+    print(f"{'stage / duration (ms)':<22} {'count':>6} {'p50':>7} {'p95':>7} {'p99':>7}")
+    for name, summary in tracing.latency_summary().items():
+        print(
+            f"{name:<22} {summary['count']:>6} {_ms(summary['p50']):>7} "
+            f"{_ms(summary['p95']):>7} {_ms(summary['p99']):>7}"
+        )
+    lag = loop_lag.histogram.summary()
+    print(
+        f"event loop lag p99 {_ms(lag['p99'])}ms (max {loop_lag.max_ms:.0f}ms), "
+        f"mic chunks dropped: {runtime_stats['audio_chunks_dropped']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent interviews")
+    parser.add_argument("--turns", type=int, default=4, help="candidate turns per interview")
+    parser.add_argument("--speech-ms", type=int, default=1500, help="length of each candidate turn")
+    parser.add_argument("--pause-ms", type=int, default=300, help="silence after each reply")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
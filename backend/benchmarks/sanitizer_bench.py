@@ -0,0 +1,91 @@
+"""
+Per-call cost of the LLM output sanitizer.
+
+Run from backend/:  PYTHONPATH=. python benchmarks/sanitizer_bench.py
+"""
+import re
+import timeit
+
+from app.core.llm_sanitizer import StreamingSanitizer, sanitize_llm_output
+
+END_TOKEN = "[END_INTERVIEW]"
+PLACEHOLDER = "__END_INTERVIEW__"
+
+
+def legacy_sanitize(text: str) -> str:
+    """The previous eight-pass implementation, for comparison."""
+    if not text:
+        return text
+    text = text.replace(END_TOKEN, PLACEHOLDER)
+    text = re.sub(r"\([^)]*\)", "", text)
+    text = re.sub(r"\[[^\]]*\]", "", text)
+    text = re.sub(r"\{[^}]*\}", "", text)
+    text = re.sub(r"<[^>]*>", "", text)
+    text = re.sub(r"\*[^*]*\*", "", text)
+    text = re.sub(r"[\[\]\(\)\{\}\*<>]", "", text)
+    text = text.replace(PLACEHOLDER, END_TOKEN)
+    text = re.sub(r"\s{2,}", " ", text)
+    return text.strip()
+
+
+SENTENCES = [
+    "That's a solid answer.",
+    "*nods* Let's move on to how you would design the caching layer.",
+    "Can you walk me through a time you disagreed with a teammate (and how it ended)?",
+    "We're out of time. Thank you for speaking with me today. [END_INTERVIEW]",
+]
+
+# Unmatched, nested and crossing symbols, some around END_TOKEN. The
+# single pass hands these to the pass-per-kind rules; output must match
+EDGE_CASES = [
+    "Thank you for your time. [smiles Good luck [END_INTERVIEW]",
+    "[Closing remarks: thank you [END_INTERVIEW]",
+    "[a [END_INTERVIEW] b]",
+    "(bye [END_INTERVIEW])",
+    "*a [END_INTERVIEW] {b*} c",
+    "[a (b] c) d",
+    "(a [b) c] d",
+    "Rate it 5* overall.\nNext (one) please",
+    "a\n(x)b <c {d> e} f",
+    "* first point\n* second point",
+]
+
+
+def stream(tokens) -> str:
+    sanitizer = StreamingSanitizer()
+    out = [sanitizer.feed(token) for token in tokens]
+    out.append(sanitizer.flush())
+    return "".join(out)
+
+
+# A reply as the LLM streams it: ~4 characters per token
+REPLY = " ".join(SENTENCES)
+TOKENS = [REPLY[i:i + 4] for i in range(0, len(REPLY), 4)]
+
+
+def stream_once() -> str:
+    return stream(TOKENS)
+
+
+def report(label: str, stmt, calls_per_run: int, number: int) -> None:
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{label:<34} {best / (number * calls_per_run) * 1e6:8.2f} µs/call")
+
+
+def main() -> None:
+    for sentence in SENTENCES + EDGE_CASES:
+        assert sanitize_llm_output(sentence) == legacy_sanitize(sentence), sentence
+    assert stream_once() == sanitize_llm_output(REPLY)
+    # The streaming path never drops END_TOKEN, even from inside a span
+    for text in EDGE_CASES:
+        streamed = stream([text[i:i + 4] for i in range(0, len(text), 4)])
+        assert streamed.count(END_TOKEN) == text.count(END_TOKEN), text
+
+    n = len(SENTENCES)
+    report("legacy (per sentence)", lambda: [legacy_sanitize(s) for s in SENTENCES], n, 20000)
+    report("single-pass (per sentence)", lambda: [sanitize_llm_output(s) for s in SENTENCES], n, 20000)
+    report("streaming (per token)", stream_once, len(TOKENS), 2000)
+
+
+if __name__ == "__main__":
+    main()